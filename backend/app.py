@@ -7,18 +7,30 @@ This code includes the following capabilities:
 5. **Operational logging:** Uses `logger` and `session_context` for session-level log tracing.
 
 Run the server to have the full system working together:
-`uvicorn backend.main:app --reload`
+`uvicorn backend.app:app --loop uvloop --http httptools`
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 
+# Prefer uvloop (libuv) over stdlib asyncio: faster scheduling on the
+# heavily-awaited /ingest_chunk path. Falls back silently if not installed.
+try:
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # --- Project Imports ---
 from .core.config import settings
-from .core.logger import logger, session_context
+from .core.logger import logger, session_context, shutdown_logging
 from .core.redis_client import redis_client
+from .core.local_storage import local_storage
+from .core.celery_batcher import celery_batcher
 # Routers (Import the new routers)
 from .routers import ingest, session, documents, feedback
 
@@ -33,13 +45,18 @@ async def lifespan(app: FastAPI):
     
     # 2. Shutdown: Cleanup
     logger.info("🛑 Shutting down...")
+    await celery_batcher.flush() # Publish any queued task messages
+    await local_storage.flush() # Land any queued SFT/DPO records first
+    local_storage.close()
     await redis_client.disconnect()
+    shutdown_logging() # Drain queued log records last
 
 # --- FastAPI Setup ---
 app = FastAPI(
     title="Clinical Scribe AI API",
     version="2.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse # orjson for all response serialization
 )
 
 # CORS (Allow UI Access)
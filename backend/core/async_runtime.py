@@ -4,23 +4,33 @@ from typing import Any, Coroutine
 
 _loop = None
 _thread = None
+_ready = threading.Event()
+_start_lock = threading.Lock()
 
 def start_background_loop() -> asyncio.AbstractEventLoop:
     global _loop, _thread
+
+    # Fast path: loop already running (no lock needed on hot run_async calls)
     if _loop is not None:
         return _loop
 
-    def _run():
-        global _loop
-        _loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(_loop)
-        _loop.run_forever()
+    with _start_lock:
+        # Re-check under the lock: another thread may have won the race
+        if _loop is not None:
+            return _loop
+
+        def _run():
+            global _loop
+            _loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(_loop)
+            _ready.set()  # Wake the starter thread (no busy-wait)
+            _loop.run_forever()
 
-    _thread = threading.Thread(target=_run, name="async-runtime-loop", daemon=True)
-    _thread.start()
+        _thread = threading.Thread(target=_run, name="async-runtime-loop", daemon=True)
+        _thread.start()
 
-    while _loop is None:
-        pass
+        # Block (0% CPU) until the runner thread has assigned the loop
+        _ready.wait()
 
     return _loop
 
@@ -30,4 +40,4 @@ def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
     """
     loop = start_background_loop()
     fut = asyncio.run_coroutine_threadsafe(coro, loop)
-    return fut.result()
\ No newline at end of file
+    return fut.result()
@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+# --- Project Imports ---
+from .celery_app import celery_app
+from .logger import logger
+
+class CeleryBatcher:
+    """
+    Coalesces fire-and-forget Celery publishes from concurrent requests.
+
+    Each send_task normally acquires a producer from the pool and pays a
+    broker round-trip on its own. enqueue() instead drops the message on
+    an in-process queue; one background flusher drains the queue and
+    publishes the whole batch over a SINGLE acquired producer (one
+    connection/channel for N messages) on a worker thread, so bursty
+    ingestion amortizes both the pool churn and the thread hops.
+
+    Only for callers that don't need the task id back — the ingest path
+    discards it anyway. Callers that do (document generation) keep the
+    direct send_task.
+
+    Failed publishes are re-enqueued with bounded retries: the HTTP
+    response has already gone out by the time the flusher runs, so a
+    dropped message could never be retried by the client.
+    """
+
+    # Drain at most BATCH_MAX messages per flush, and never hold a
+    # message longer than FLUSH_INTERVAL seconds waiting for peers.
+    BATCH_MAX = 32
+    FLUSH_INTERVAL = 0.01
+    # A failed publish is re-enqueued up to this many attempts — losing a
+    # process_audio_chunk message would wedge the session's chunk ordering
+    # for the rest of its TTL, so dropping silently is not an option.
+    PUBLISH_RETRIES = 3
+    RETRY_DELAY = 1.0
+
+    def __init__(self):
+        # Created lazily so they bind to the running event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    async def enqueue(self, name: str, kwargs: Dict[str, Any]):
+        """
+        Queues one task message for the next batched publish.
+        """
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+            self._flusher = asyncio.create_task(self._run())
+        self._queue.put_nowait((name, kwargs, 0))
+
+    async def _run(self):
+        while True:
+            # Block for the first message, then linger briefly so
+            # concurrent uploads land in the same batch
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            while len(batch) < self.BATCH_MAX:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            try:
+                await asyncio.to_thread(
+                    self._publish_batch, [(name, kwargs) for name, kwargs, _ in batch]
+                )
+            except Exception as e:
+                logger.exception(f"❌ Celery batch publish failed ({len(batch)} msgs): {e}")
+                requeued = 0
+                for name, kwargs, attempts in batch:
+                    if attempts + 1 < self.PUBLISH_RETRIES:
+                        self._queue.put_nowait((name, kwargs, attempts + 1))
+                        requeued += 1
+                    else:
+                        logger.critical(
+                            f"❌ Dropping task '{name}' after {self.PUBLISH_RETRIES} "
+                            f"failed publishes — manual intervention needed: {kwargs}"
+                        )
+                if requeued:
+                    # Give the broker a moment before the retry flush
+                    await asyncio.sleep(self.RETRY_DELAY)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _publish_batch(self, batch: List[Tuple[str, Dict[str, Any]]]):
+        # One producer (connection + channel) for the whole batch instead
+        # of a pool acquire per message
+        with celery_app.producer_pool.acquire(block=True) as producer:
+            for name, kwargs in batch:
+                celery_app.send_task(name, kwargs=kwargs, producer=producer)
+
+    async def flush(self):
+        """Waits until every queued message has been published."""
+        if self._queue is not None:
+            await self._queue.join()
+
+# Global Access Point
+celery_batcher = CeleryBatcher()
@@ -0,0 +1,72 @@
+"""
+Transparent compression for large JSON blobs stored in Redis.
+
+SOAP notes (and similar accumulated state) grow to tens of KB of highly
+repetitive JSON over a consultation; zstd typically shrinks them 5-10x,
+cutting Redis bandwidth on every per-chunk read/write.
+
+Both Redis clients run with decode_responses=True (str in/out), so the
+compressed payload is base64-wrapped and tagged with a prefix. Values
+without the prefix are returned untouched, which keeps old uncompressed
+blobs readable (back-compat).
+"""
+import base64
+from typing import Union
+import zstandard
+
+# Marker distinguishing compressed values from plain JSON strings
+ZSTD_PREFIX = "zstd:"
+
+# Payloads below this size aren't worth the compress/base64 overhead
+MIN_COMPRESS_SIZE = 1024
+
+_compressor = zstandard.ZstdCompressor(level=3)
+_decompressor = zstandard.ZstdDecompressor()
+
+def compress_text(text: Union[str, bytes]) -> Union[str, bytes]:
+    """
+    Compresses a string payload if it's large enough to benefit.
+    Small payloads pass through unchanged.
+
+    Accepts utf-8 bytes too (e.g. straight from a pydantic serializer),
+    skipping the encode pass; redis-py writes either form identically.
+    """
+    raw = text if isinstance(text, bytes) else text.encode("utf-8")
+    if len(raw) < MIN_COMPRESS_SIZE:
+        return text
+
+    return ZSTD_PREFIX + base64.b64encode(_compressor.compress(raw)).decode("ascii")
+
+def decompress_text(data: str) -> str:
+    """
+    Reverses compress_text. Non-prefixed values (legacy/small) pass through.
+    """
+    if not data.startswith(ZSTD_PREFIX):
+        return data
+
+    return _decompressor.decompress(base64.b64decode(data[len(ZSTD_PREFIX):])).decode("utf-8")
+
+# --- Raw bytes variants (no base64) ---
+# For values stored through the raw (decode_responses=False) client the
+# payload can stay binary, so the base64 detour is unnecessary.
+
+ZSTD_BYTES_PREFIX = b"zstd:"
+
+def compress_bytes(raw: bytes) -> bytes:
+    """
+    Compresses a bytes payload if it's large enough to benefit.
+    Small payloads pass through unchanged.
+    """
+    if len(raw) < MIN_COMPRESS_SIZE:
+        return raw
+
+    return ZSTD_BYTES_PREFIX + _compressor.compress(raw)
+
+def decompress_bytes(data: bytes) -> bytes:
+    """
+    Reverses compress_bytes. Non-prefixed values (legacy/small) pass through.
+    """
+    if not data.startswith(ZSTD_BYTES_PREFIX):
+        return data
+
+    return _decompressor.decompress(data[len(ZSTD_BYTES_PREFIX):])
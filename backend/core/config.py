@@ -48,6 +48,10 @@ class Settings(BaseSettings):
     # 4. AUDIO SETTINGS
     # ==========================================
     whisper_model_size: str = "small.en"
+    # CTranslate2 compute type: 'int8' (CPU), 'int8_float16'/'float16' (GPU)
+    whisper_compute_type: str = Field("int8", alias="WHISPER_COMPUTE_TYPE")
+    whisper_device: str = Field("cpu", alias="WHISPER_DEVICE")
+    whisper_batch_size: int = Field(2, alias="WHISPER_BATCH_SIZE")
 
     # ==========================================
     # 5. SECRETS
@@ -72,6 +76,14 @@ class Settings(BaseSettings):
     # ==========================================
     redis_url: str = Field(..., alias="REDIS_URL")
     session_ttl: int = 3600
+    # Bounded connection pool: cap concurrent sockets and how long a caller
+    # may wait for a free one before erroring
+    redis_pool_size: int = Field(50, alias="REDIS_POOL_SIZE")
+    redis_pool_timeout: float = Field(1.0, alias="REDIS_POOL_TIMEOUT")
+    # Staging dir for uploaded audio chunks. Point at a tmpfs mount
+    # (e.g. /dev/shm/clinical_audio) to keep the ingest hot path off disk;
+    # the API and the Celery worker must share this path.
+    upload_dir: str = Field("temp_audio_uploads", alias="UPLOAD_DIR")
     # ==========================================)
 
     # Load from .env file
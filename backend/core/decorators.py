@@ -1,31 +1,22 @@
-import asyncio
 import functools
 # --- Project Imports ---
-from ..core.redis_client import RedisClient, redis_client
+from ..core.redis_client import redis_client
+from ..core.async_runtime import run_async
 
 def async_worker_task(func):
     """
     Async wrapper for Celery tasks.
-    1. Automatically executes asyncio.run().
-    2. Automatically establishes Redis connection.
-    3. Automatically closes Redis connection when task completes.
+    1. Runs the coroutine on the persistent background loop (not asyncio.run),
+       so the Redis connection pool survives across tasks.
+    2. Reuses the cached connection; reconnects only if the health check fails.
     """
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         async def _runner():
-            # 1. Kill existing connection (if any) 
-            if RedisClient._instance:
-                RedisClient._instance = None
+            # Cheap when cached: one PING instead of a TCP+AUTH handshake per task.
+            await redis_client.ensure_connection()
+            return await func(*args, **kwargs)
 
-            # 2. Establish new connection
-            print(f"🔄 [Task] Forcing new Redis connection for Event Loop...")
-            await redis_client.connect()
+        return run_async(_runner())
 
-            try:
-                return await func(*args, **kwargs)
-            finally:
-                await redis_client.disconnect()
-            
-        return asyncio.run(_runner())
-    
     return wrapper
@@ -0,0 +1,18 @@
+"""
+Thin facade over orjson so hot paths share one fast JSON implementation.
+
+orjson serializes to bytes (Redis and file writers accept bytes directly)
+and handles datetime/UUID natively, 3-10x faster than stdlib json.
+"""
+import orjson
+
+# orjson.loads accepts str, bytes, or bytearray
+loads = orjson.loads
+
+def dumps(obj) -> bytes:
+    """Serialize to JSON bytes."""
+    return orjson.dumps(obj)
+
+def dumps_str(obj) -> str:
+    """Serialize to a JSON string (for callers that need str, e.g. pub/sub payloads)."""
+    return orjson.dumps(obj).decode("utf-8")
@@ -1,20 +1,104 @@
-from transformers import pipeline
+import os
+import asyncio
+import torch
+from concurrent.futures import ThreadPoolExecutor
+from transformers import pipeline, AutoTokenizer
 from sentence_transformers import CrossEncoder
 from functools import lru_cache
 from .logger import logger
 
+# --- CPU thread affinity ---
+# The NER/NLI models share the box with vLLM's CUDA host thread. Cap torch's
+# intra-op pool to a slice of the cores so guardrail work can't starve the
+# LLM scheduler, and keep inter-op at 1 (these are single-graph forwards).
+torch.set_num_threads(max(2, (os.cpu_count() or 4) // 4))
+try:
+    torch.set_num_interop_threads(1)
+except RuntimeError:
+    pass  # Already initialized (e.g. another import ran a torch op first)
+
+# Dedicated 2-thread pool for CPU model forwards: async callers queue here
+# instead of the default (large) to_thread pool, bounding CPU contention.
+_cpu_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cpu-model")
+
+async def run_cpu_model(fn, *args):
+    """
+    Runs a CPU-bound model call on the dedicated model threadpool.
+    """
+    return await asyncio.get_running_loop().run_in_executor(_cpu_pool, fn, *args)
+
+class _InferenceModeWrapper:
+    """
+    Wraps a model so every forward runs under torch.inference_mode()
+    (no autograd bookkeeping: 5-15% off CPU transformer inference).
+    Everything else is delegated to the wrapped model.
+    """
+    def __init__(self, model):
+        self._model = model
+
+    def __call__(self, *args, **kwargs):
+        with torch.inference_mode():
+            return self._model(*args, **kwargs)
+
+    def predict(self, *args, **kwargs):
+        with torch.inference_mode():
+            return self._model.predict(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._model, name)
+
+NER_MODEL_ID = "d4data/biomedical-ner-all"
+NLI_MODEL_ID = "cross-encoder/nli-deberta-v3-base"
+
+# Local cache for the exported/quantized ONNX weights (exported once, reused)
+ONNX_CACHE_DIR = "model_cache"
+
 @lru_cache(maxsize=1)
 def get_ner_pipeline():
     print("🔄 Loading NER Model... (This should happen only ONCE)")
-    return pipeline(
-                "token-classification", 
-                model="d4data/biomedical-ner-all", 
-                aggregation_strategy="first", 
-                device=-1 # Run on CPU to save GPU VRAM for vLLM
-            )
+
+    # Preferred path: ONNX Runtime with int8 dynamic quantization.
+    # NER is compute-bound on CPU; int8 GEMM is a 2-4x win over FP32 PyTorch.
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification, ORTQuantizer
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        quantized_dir = os.path.join(ONNX_CACHE_DIR, "ner_int8")
+
+        if not os.path.exists(quantized_dir):
+            logger.info("⚙️ Exporting NER model to ONNX int8 (one-time)...")
+            model = ORTModelForTokenClassification.from_pretrained(NER_MODEL_ID, export=True)
+            quantizer = ORTQuantizer.from_pretrained(model)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer.quantize(save_dir=quantized_dir, quantization_config=qconfig)
+
+        model = ORTModelForTokenClassification.from_pretrained(quantized_dir)
+        tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_ID)
+
+        logger.info("✅ NER pipeline running on ONNX Runtime (int8).")
+        return _InferenceModeWrapper(pipeline(
+            "token-classification",
+            model=model,
+            tokenizer=tokenizer,
+            aggregation_strategy="first",
+        ))
+
+    except Exception as e:
+        logger.warning(f"⚠️ ONNX int8 NER unavailable ({e}). Falling back to PyTorch.")
+        return _InferenceModeWrapper(pipeline(
+                    "token-classification",
+                    model=NER_MODEL_ID,
+                    aggregation_strategy="first",
+                    device=-1 # Run on CPU to save GPU VRAM for vLLM
+                ))
 
 @lru_cache(maxsize=1)
 def get_nli_pipeline():
     logger.info(f"🛡️ Loading Medical NLI Model...")
-    return CrossEncoder("cross-encoder/nli-deberta-v3-base", device='cpu')
-    
+
+    # Same idea as NER: prefer the ONNX Runtime backend on CPU.
+    try:
+        return _InferenceModeWrapper(CrossEncoder(NLI_MODEL_ID, device="cpu", backend="onnx"))
+    except Exception as e:
+        logger.warning(f"⚠️ ONNX CrossEncoder unavailable ({e}). Falling back to PyTorch.")
+        return _InferenceModeWrapper(CrossEncoder(NLI_MODEL_ID, device='cpu'))
@@ -1,10 +1,15 @@
-import json
+import asyncio
+import atexit
 import os
-import aiofiles
+import time
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Tuple
+
+# Local timezone resolved once; astimezone() on every record re-queries it
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
 
 # --- Project Imports ---
+from ..core import json_fast
 from ..core.config import settings
 from ..core.logger import logger
 
@@ -12,8 +17,17 @@ class LocalStorageClient:
     """
     Manages local file storage (JSONL) for data collection (SFT/DPO).
     Mimics a database connection but writes to local files for simplicity.
+
+    Writes are coalesced: append_record enqueues, and one background
+    flusher per filename drains the queue and lands a whole batch with a
+    single open+write+close instead of paying those syscalls per record.
     """
 
+    # Flusher tuning: write at most BATCH_MAX records per open, and never
+    # hold a record longer than FLUSH_INTERVAL seconds waiting for peers.
+    BATCH_MAX = 256
+    FLUSH_INTERVAL = 0.02
+
     def __init__(self):
         # Ensure the storage directory exists based on config
         self.data_dir = settings.data_dir
@@ -21,52 +35,183 @@ class LocalStorageClient:
             os.makedirs(self.data_dir, exist_ok=True)
             logger.info(f"📁 Created data directory: {self.data_dir}")
 
+        # Per-filename write queues + their flusher tasks (created lazily)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+
+        # (epoch seconds, iso string) of the last timestamp we formatted
+        self._ts_cache: Tuple[float, str] = (0.0, "")
+
+        # One long-lived O_APPEND fd per file: appends are atomic writes
+        # and skip the open/close syscall pair per batch
+        self._fds: Dict[str, int] = {}
+        atexit.register(self.close)
+
+        # Joined paths, cached per filename (the set of filenames is tiny)
+        self._path_cache: Dict[str, str] = {}
+
+    def _p(self, filename: str) -> str:
+        path = self._path_cache.get(filename)
+        if path is None:
+            path = os.path.join(self.data_dir, filename)
+            self._path_cache[filename] = path
+        return path
+
     async def append_record(self, filename: str, record: Dict[str, Any]):
         """
-        Appends a single dictionary record to a JSONL file asynchronously.
-        
+        Queues a single dictionary record for appending to a JSONL file.
+        The background flusher batches queued records into one disk write.
+
         Args:
             filename: The name of the file (e.g., "sft_train.jsonl").
             record: The data dictionary to save.
         """
-        file_path = os.path.join(self.data_dir, filename)
-        
-        # Add metadata (Timestamp) for audit purposes
-        # using .copy() to avoid modifying the original dict reference
-        save_data = record.copy()
-        save_data["_created_at"] = datetime.now().astimezone().isoformat()
-        
-        try:
-            # Open in 'append' mode asynchronously
-            # ensure_ascii=False ensures non-English characters (Korean) are saved correctly
-            async with aiofiles.open(file_path, mode='a', encoding='utf-8') as f:
-                json_line = json.dumps(save_data, ensure_ascii=False)
-                await f.write(json_line + "\n")
-                
-        except Exception as e:
-            logger.error(f"❌ Failed to write to {filename}: {e}")
-            raise e
+        # Add metadata (Timestamp) for audit purposes. Instead of cloning
+        # the dict just to attach it, serialize once and splice the field
+        # into the JSON bytes — no copy, and the flusher gets a ready line.
+        ts = self._now_iso().encode()
+        line = json_fast.dumps(record)
+        if line == b"{}":
+            line = b'{"_created_at":"' + ts + b'"}'
+        elif line.startswith(b"{"):
+            line = line[:-1] + b',"_created_at":"' + ts + b'"}'
+        else:
+            # Non-object payload: fall back to copy + re-serialize
+            save_data = record.copy()
+            save_data["_created_at"] = ts.decode()
+            line = json_fast.dumps(save_data)
+
+        await self._get_queue(filename).put(line)
+
+    def _now_iso(self) -> str:
+        """
+        ISO timestamp with ~1ms granularity. Records landing within the same
+        millisecond share one cached string instead of re-running the
+        datetime formatting machinery per record.
+        """
+        now = time.time()
+        cached_at, cached_iso = self._ts_cache
+        if now - cached_at >= 0.001 or not cached_iso:
+            cached_iso = datetime.fromtimestamp(now, tz=_LOCAL_TZ).isoformat()
+            self._ts_cache = (now, cached_iso)
+        return cached_iso
+
+    def _get_queue(self, filename: str) -> asyncio.Queue:
+        # Lazy init so the queue/task bind to the running loop
+        if filename not in self._queues:
+            self._queues[filename] = asyncio.Queue()
+            self._flushers[filename] = asyncio.get_running_loop().create_task(
+                self._flusher(filename)
+            )
+        return self._queues[filename]
+
+    async def _flusher(self, filename: str):
+        """
+        Drains the filename's queue forever: collects up to BATCH_MAX records
+        (waiting at most FLUSH_INTERVAL for stragglers) and writes them as one
+        blob. One open+write+close per batch instead of per record.
+        """
+        queue = self._queues[filename]
+        file_path = self._p(filename)
+
+        while True:
+            batch = [await queue.get()]
+
+            deadline = asyncio.get_running_loop().time() + self.FLUSH_INTERVAL
+            while len(batch) < self.BATCH_MAX:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Records arrive pre-serialized (orjson emits raw UTF-8, so
+            # non-English characters like Korean are saved correctly)
+            blob = b"\n".join(batch) + b"\n"
+
+            try:
+                await asyncio.to_thread(self._append_blob, file_path, blob)
+            except Exception as e:
+                logger.error(f"❌ Failed to write to {filename}: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _append_blob(self, file_path: str, blob: bytes):
+        # Single write(2) on the cached O_APPEND fd: the whole batch lands
+        # atomically with no open/close per batch
+        os.write(self._get_fd(file_path), blob)
+
+    def _get_fd(self, file_path: str) -> int:
+        fd = self._fds.get(file_path)
+        if fd is None:
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            self._fds[file_path] = fd
+        return fd
+
+    def close(self):
+        """Closes all cached file descriptors (atexit / app shutdown)."""
+        while self._fds:
+            _, fd = self._fds.popitem()
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    async def flush(self):
+        """
+        Waits until every queued record has been written to disk.
+        Call on shutdown so no training data is lost.
+        """
+        for queue in self._queues.values():
+            await queue.join()
 
     async def get_all_records(self, filename: str) -> List[Dict[str, Any]]:
         """
         Reads all records from a JSONL file.
         Useful for analytics, debugging, or creating a download export.
+        One thread dispatch for the whole file instead of one per line.
         """
-        file_path = os.path.join(self.data_dir, filename)
-        if not os.path.exists(file_path):
-            return []
-
-        records = []
         try:
-            async with aiofiles.open(file_path, mode='r', encoding='utf-8') as f:
-                async for line in f:
-                    if line.strip():
-                        records.append(json.loads(line))
+            return await asyncio.to_thread(self._sync_read_all, self._p(filename))
+        except FileNotFoundError:
+            return []
         except Exception as e:
             logger.error(f"❌ Failed to read {filename}: {e}")
             return []
-            
-        return records
+
+    async def iter_records(self, filename: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields records one at a time instead of materializing the whole
+        file as a list — lets an export endpoint stream millions of SFT
+        rows through a StreamingResponse without pinning them in RAM.
+        Yields control back to the loop every 1000 records.
+        """
+        try:
+            f = open(self._p(filename), mode='rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            parsed = 0
+            for line in f:
+                if not line.strip():
+                    continue
+                yield json_fast.loads(line)
+                parsed += 1
+                if parsed % 1000 == 0:
+                    # Don't starve the event loop on huge exports
+                    await asyncio.sleep(0)
+
+    @staticmethod
+    def _sync_read_all(file_path: str) -> List[Dict[str, Any]]:
+        # Slurp bytes once and split: O(N) with no per-line IO or decode step
+        # (orjson parses the utf-8 bytes directly)
+        with open(file_path, mode='rb') as f:
+            data = f.read()
+        return [json_fast.loads(line) for line in data.split(b"\n") if line.strip()]
 
 # Singleton Instance
 local_storage = LocalStorageClient()
\ No newline at end of file
@@ -1,23 +1,41 @@
 import logging
+import os
+import queue
 import sys
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from .config import settings
+
+# Emit ANSI colors only when stdout is a real terminal (and NO_COLOR is
+# unset): escapes bloat log volume and corrupt journald/Docker ingestion.
+USE_COLOR = sys.stdout.isatty() and os.environ.get("NO_COLOR") is None
+
 # --- 1. Session Context (The Magic Variable) ---
 # This ContextVar works like a "Thread-Local" variable but for Asyncio.
 # It holds the 'session_id' specific to the current request context.
 # Default is 'System' (for startup logs or background tasks).
 session_context: ContextVar[str] = ContextVar("session_id", default="System")
 
-class SessionFilter(logging.Filter):
+def _session_record_factory():
     """
-    A Logging Filter that injects the current 'session_id' 
-    from the ContextVar into every log record.
+    Builds a LogRecord factory that stamps 'session_id' on every record.
+    One attribute set in the factory replaces a logging.Filter dispatch
+    per handler per record; the ContextVar getter is bound to a local so
+    the hot path skips the attribute lookup too.
     """
-    def filter(self, record):
-        # This makes 'record.session_id' available for the Formatter
-        record.session_id = session_context.get()
-        return True
+    base_factory = logging.getLogRecordFactory()
+    get_session = session_context.get
+
+    def factory(*args, **kwargs):
+        record = base_factory(*args, **kwargs)
+        record.session_id = get_session()
+        return record
+
+    return factory
+
+logging.setLogRecordFactory(_session_record_factory())
 
 class ColoredFormatter(logging.Formatter):
     """
@@ -44,37 +62,79 @@ class ColoredFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + fmt_str + reset
     }
 
+    def __init__(self):
+        super().__init__()
+        # One Formatter per level, built once — format() used to construct
+        # a fresh Formatter (object + style parse) for every log line.
+        # Plain format everywhere when output isn't a TTY.
+        self._formatters = {
+            level: logging.Formatter(fmt if USE_COLOR else self.fmt_str,
+                                     datefmt="%H:%M:%S")
+            for level, fmt in self.FORMATS.items()
+        }
+        self._default_formatter = logging.Formatter(self.fmt_str, datefmt="%H:%M:%S")
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt, datefmt="%H:%M:%S")
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
 
+# Background listener draining the log queue (started in setup_logger,
+# stopped via shutdown_logging in the FastAPI lifespan)
+_log_listener: Optional[QueueListener] = None
+
 def setup_logger():
     """
     Configures and returns the application logger.
+
+    Handlers sit behind a QueueHandler: a log call only enqueues the
+    record, and a background QueueListener thread does the actual console
+    and file writes — no disk flush ever blocks the event loop.
     """
+    global _log_listener
+
     # Create a named logger (avoid using root logger to prevent library conflicts)
     logger = logging.getLogger("clinical_backend")
     logger.setLevel(logging.INFO)
-    
+
     # Prevent adding multiple handlers if setup is called multiple times
     if not logger.handlers:
         # 1. Stream Handler (Console)
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(ColoredFormatter())
-        console_handler.addFilter(SessionFilter()) # 👈 Inject Session ID
-        
-        logger.addHandler(console_handler)
-        
-        # 2. File Handler (Optional: For persistent logs)
-        # file_handler = logging.FileHandler("app_system.log")
-        # file_formatter = logging.Formatter("[%(asctime)s] [%(levelname)s] [%(session_id)s] %(message)s")
-        # file_handler.setFormatter(file_formatter)
-        # file_handler.addFilter(SessionFilter())
-        # logger.addHandler(file_handler)
+        # session_id comes from the record factory above — no filter needed
+
+        # 2. File Handler (Persistent logs — safe now that writes are
+        # off the event loop). Lives under data_dir, NOT the process CWD,
+        # so importing the logger never litters the working directory.
+        os.makedirs(settings.data_dir, exist_ok=True)
+        file_handler = logging.FileHandler(
+            os.path.join(settings.data_dir, "app_system.log"), encoding="utf-8"
+        )
+        file_handler.setFormatter(
+            logging.Formatter(ColoredFormatter.fmt_str, datefmt="%H:%M:%S")
+        )
+
+        # 3. Queue: the app only enqueues; the listener thread writes
+        log_queue: queue.Queue = queue.Queue(-1)
+        logger.addHandler(QueueHandler(log_queue))
+
+        _log_listener = QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        _log_listener.start()
 
     return logger
 
+def shutdown_logging():
+    """
+    Flushes and stops the background log listener. Call on app shutdown
+    so queued records land before the process exits.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
 # --- Singleton Export ---
 # Use this 'logger' throughout the app.
 # Use 'session_context' in middleware to set the session ID.
@@ -24,17 +24,31 @@ class RedisClient:
         print(f"🔌 Connecting to Redis at {settings.redis_url}dc...")
         
         try:
-            # Initialize Async Redis Client
+            # Initialize Async Redis Client over a bounded BLOCKING pool:
+            # at most redis_pool_size sockets, and handlers wait (briefly)
+            # for a free one instead of opening unbounded connections.
             # decode_responses=True ensures we get 'str' instead of 'bytes'
-            cls._instance = redis.Redis.from_url(
-                url=settings.redis_url, 
+            pool = redis.BlockingConnectionPool.from_url(
+                url=settings.redis_url,
+                max_connections=settings.redis_pool_size,
+                timeout=settings.redis_pool_timeout,
                 encoding="utf-8",
                 decode_responses=True,
+                # RESP3 + hiredis C parser (auto-picked when installed):
+                # far cheaper reply parsing on the hot hget/hset path
+                protocol=3,
+                socket_read_size=65536,
                 socket_timeout=5,
-                max_connections=30, 
-                retry_on_timeout=True
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                # Set at handshake on EVERY pooled connection, so CLIENT
+                # LIST attributes pool usage (CLIENT SETNAME after connect
+                # would only name whichever connection served it)
+                client_name="clinical-backend-api"
             )
-            
+            cls._instance = redis.Redis(connection_pool=pool)
+
             # Ping to verify connection
             await cls._instance.ping()
             print("✅ Redis connection established successfully.")
@@ -56,6 +70,27 @@ class RedisClient:
             cls._instance = None
             print("✅ Redis connection closed.")
 
+    @classmethod
+    async def ensure_connection(cls) -> redis.Redis:
+        """
+        Returns a healthy client, connecting (or reconnecting) only if needed.
+        Cheap when the cached connection is alive: a single PING over the
+        already-multiplexed pool instead of a fresh TCP+AUTH handshake.
+        """
+        if cls._instance is None:
+            await cls.connect()
+            return cls._instance
+
+        try:
+            await cls._instance.ping()
+        except Exception:
+            # Stale/broken connection (e.g. Redis restarted). Rebuild it.
+            print("⚠️ Cached Redis connection unhealthy. Reconnecting...")
+            cls._instance = None
+            await cls.connect()
+
+        return cls._instance
+
     @classmethod
     def get_instance(cls) -> redis.Redis:
         """
@@ -13,6 +13,8 @@ class RedisClientSync:
     """
 
     _instance: Optional[redis.Redis] = None
+    # Second client without decode_responses: raw bytes for JSON payloads
+    _raw_instance: Optional[redis.Redis] = None
 
     @classmethod
     def connect(cls) -> None:
@@ -23,14 +25,26 @@ class RedisClientSync:
         if cls._instance is not None:
             return
         try:
-            cls._instance = redis.Redis.from_url(
-                url=settings.redis_url, 
+            # Same bounded blocking pool as the async client: worker threads
+            # queue for a free socket instead of opening new ones unbounded.
+            pool = redis.BlockingConnectionPool.from_url(
+                url=settings.redis_url,
+                max_connections=settings.redis_pool_size,
+                timeout=settings.redis_pool_timeout,
                 encoding="utf-8",
                 decode_responses=True,
+                # RESP3 + hiredis parser, matching the async client
+                protocol=3,
+                socket_read_size=65536,
                 socket_timeout=5,
-                max_connections=30, 
-                retry_on_timeout=True
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                # Set at handshake on EVERY pooled connection (a one-off
+                # CLIENT SETNAME would only name the connection that ran it)
+                client_name="clinical-backend-worker"
             )
+            cls._instance = redis.Redis(connection_pool=pool)
 
             # Fail-fast (optional but recommended)
             cls._instance.ping()
@@ -52,6 +66,29 @@ class RedisClientSync:
             raise ConnectionError("Redis is not initialized. Ensure 'connect()' is called during startup.")
         return cls._instance
 
+    @classmethod
+    def get_raw_instance(cls) -> redis.Redis:
+        """
+        Returns a client WITHOUT decode_responses. JSON payloads (buffer
+        chunks) feed orjson directly as bytes, skipping the utf-8 decode
+        that the default client runs on every reply.
+        """
+        if cls._raw_instance is None:
+            pool = redis.BlockingConnectionPool.from_url(
+                url=settings.redis_url,
+                max_connections=settings.redis_pool_size,
+                timeout=settings.redis_pool_timeout,
+                protocol=3,
+                socket_read_size=65536,
+                socket_timeout=5,
+                socket_keepalive=True,
+                health_check_interval=30,
+                retry_on_timeout=True,
+                client_name="clinical-backend-worker-raw"
+            )
+            cls._raw_instance = redis.Redis(connection_pool=pool)
+        return cls._raw_instance
+
     @classmethod
     def disconnect(cls) -> None:
         """
@@ -62,6 +99,11 @@ class RedisClientSync:
                 cls._instance.close()
             finally:
                 cls._instance = None
+        if cls._raw_instance is not None:
+            try:
+                cls._raw_instance.close()
+            finally:
+                cls._raw_instance = None
 
 # Global Access Point (same naming as async version)
 redis_client = RedisClientSync
\ No newline at end of file
@@ -1,9 +1,11 @@
 # backend/prompts/__init__.py
+from functools import lru_cache
+
 from . import soap, referral, scribe_system, role_service, certificate
 
 # 1. System Prompt Router
 SYSTEM_REGISTRY = {
-    "role_service": role_service, 
+    "role_service": role_service,
     "soap": scribe_system,
     "referral": scribe_system,     # Referral also uses the generic Scribe identity
     "certificate": scribe_system   # Certificate also uses the generic Scribe identity
@@ -16,14 +18,38 @@ SUFFIX_REGISTRY = {
     "certificate": certificate
 }
 
-def get_system_prompt(task_type: str) -> str:
-    module = SYSTEM_REGISTRY.get(task_type)
-    if hasattr(module, "get_prompt"):
-        return module.get_prompt()
+def _default_system_prompt() -> str:
     return "You are a helpful medical assistant."
 
+# Pre-bound callables: the hasattr probe + module attribute lookup happen
+# once here, so each LLM call is a dict get + call.
+SYSTEM_FNS = {
+    task: module.get_prompt
+    for task, module in SYSTEM_REGISTRY.items()
+    if hasattr(module, "get_prompt")
+}
+SUFFIX_FNS = {
+    task: module.get_suffix
+    for task, module in SUFFIX_REGISTRY.items()
+    if hasattr(module, "get_suffix")
+}
+
+def get_system_prompt(task_type: str) -> str:
+    return SYSTEM_FNS.get(task_type, _default_system_prompt)()
+
+# Contexts short enough to be worth caching: early-turn contexts (e.g.
+# "None", near-empty notes) repeat constantly; long later-turn contexts
+# are effectively unique, so caching them would only churn entries.
+_CACHEABLE_CONTEXT_LEN = 2048
+
+@lru_cache(maxsize=256)
+def _cached_suffix(task_type: str, context: str) -> str:
+    return SUFFIX_FNS[task_type](task_type, context)
+
 def get_suffix_prompt(task_type: str, context: str = "None") -> str:
-    module = SUFFIX_REGISTRY.get(task_type)
-    if module and hasattr(module, "get_suffix"):
-        return module.get_suffix(task_type, context)
-    return ""
\ No newline at end of file
+    suffix_fn = SUFFIX_FNS.get(task_type)
+    if not suffix_fn:
+        return ""
+    if len(context) > _CACHEABLE_CONTEXT_LEN:
+        return suffix_fn(task_type, context)
+    return _cached_suffix(task_type, context)
@@ -1,24 +1,27 @@
 # backend/prompts/certificate.py
 
+# Constant halves around the SOAP-note slot, joined once at import
+_PREFIX = "--- REFERENCE: FINAL SOAP NOTE ---\n"
+_SUFFIX = (
+    "\n\n"
+    "TASK: Write a formal Medical Certificate based on the SOAP note above.\n"
+    "Output Format: PLAIN TEXT ONLY.\n"
+    "Constraints:\n"
+    "1. Do NOT use JSON.\n"
+    "2. Do NOT include conversational fillers like 'Here is the certificate'.\n"
+    "3. Start directly with the title 'MEDICAL CERTIFICATE'.\n"
+    "4. Structure must include:\n"
+    "   - Patient Name & Demographics (use placeholders if missing)\n"
+    "   - Date of Exam\n"
+    "   - Diagnosis (Assessment)\n"
+    "   - Unfitness for work/school (Duration)\n"
+    "   - Doctor's Name/Signature placeholder\n"
+    "5. Keep the tone strictly formal and medico-legal."
+)
+
 def get_suffix(task_type: str, context: str) -> str:
     """
     Returns instructions for generating a Medical Certificate.
     Enforces Plain Text output (No JSON) and formal legal tone.
     """
-    return (
-        f"--- REFERENCE: FINAL SOAP NOTE ---\n"
-        f"{context}\n\n"
-        f"TASK: Write a formal Medical Certificate based on the SOAP note above.\n"
-        f"Output Format: PLAIN TEXT ONLY.\n"
-        f"Constraints:\n"
-        f"1. Do NOT use JSON.\n"
-        f"2. Do NOT include conversational fillers like 'Here is the certificate'.\n"
-        f"3. Start directly with the title 'MEDICAL CERTIFICATE'.\n"
-        f"4. Structure must include:\n"
-        f"   - Patient Name & Demographics (use placeholders if missing)\n"
-        f"   - Date of Exam\n"
-        f"   - Diagnosis (Assessment)\n"
-        f"   - Unfitness for work/school (Duration)\n"
-        f"   - Doctor's Name/Signature placeholder\n"
-        f"5. Keep the tone strictly formal and medico-legal."
-    )
\ No newline at end of file
+    return _PREFIX + context + _SUFFIX
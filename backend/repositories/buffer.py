@@ -1,50 +1,80 @@
-import json
 from typing import Optional, Dict, Any
 # --- Project Imports ---
+from ..core import json_fast
+from ..core.compression import compress_bytes, decompress_bytes
 from ..core.config import settings
 
 # Session TimeOUt
 SESSION_TTL = settings.session_ttl
 
+# HSET + EXPIRE as one server-side command. Even pipelined, two commands
+# are parsed and dispatched separately; the script is a single EVALSHA.
+_HSET_EXPIRE_LUA = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return redis.call('EXPIRE', KEYS[1], ARGV[3])
+"""
+
+def get_buffer_key(session_id: str) -> str:
+    return f"session:{session_id}:buffer"
+
 class BufferServiceSync:
     """
     Manages temporary buffers in Redis.
     Used for storing intermediate
     """
     def __init__(self, redis_client):
-        self.redis_client = redis_client.get_instance()
+        # Raw (bytes) client: chunk payloads are JSON that orjson parses
+        # directly from bytes, so the per-reply utf-8 decode is wasted work
+        self.redis_client = redis_client.get_raw_instance()
+        # register_script caches the SHA and transparently reloads on NOSCRIPT
+        self._hset_expire = self.redis_client.register_script(_HSET_EXPIRE_LUA)
 
     def save_chunk(self, session_id: str, chunk_index: int, payload: Dict[str, Any]):
         """
         Saves a chunk of data in a Redis hash.
         Each chunk is stored under a field named by its index.
         """
-        key = f"session:{session_id}:buffer"
+        key = get_buffer_key(session_id)
 
-        # Store the chunk as a JSON string
-        self.redis_client.hset(key, str(chunk_index), json.dumps(payload))
-
-        # Reset Expiration (Extend session life)
-        self.redis_client.expire(key, SESSION_TTL)
+        # Store the chunk (orjson bytes, zstd-compressed when large) and
+        # refresh the session TTL in a single EVALSHA round-trip
+        self._hset_expire(
+            keys=[key],
+            args=[str(chunk_index), compress_bytes(json_fast.dumps(payload)), SESSION_TTL],
+        )
 
     def get_chunk(self, session_id: str, chunk_index: int) -> Optional[Dict[str, Any]]:
         """
         Retrieves a specific chunk of data from the Redis hash.
         Returns None if the chunk does not exist.
         """
-        key = f"session:{session_id}:buffer"
+        key = get_buffer_key(session_id)
 
         raw_data = self.redis_client.hget(key, str(chunk_index))
         if raw_data is None:
             return None
         
-        return json.loads(raw_data)
+        return json_fast.loads(decompress_bytes(raw_data))
+
+    def get_all_chunks(self, session_id: str) -> Dict[int, Dict[str, Any]]:
+        """
+        Retrieves every buffered chunk in one HGETALL round-trip,
+        keyed by chunk index. N separate get_chunk calls pay N RTTs;
+        this pays one.
+        """
+        key = get_buffer_key(session_id)
+
+        raw = self.redis_client.hgetall(key)
+        return {
+            int(field): json_fast.loads(decompress_bytes(value))
+            for field, value in raw.items()
+        }
 
     def del_chunk(self, session_id: str, chunk_index: int):
         """
         Deletes a specific chunk from the Redis hash.
         """
-        key = f"session:{session_id}:buffer"
+        key = get_buffer_key(session_id)
 
         self.redis_client.hdel(key, str(chunk_index))
 
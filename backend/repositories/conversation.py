@@ -1,14 +1,67 @@
-import json
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Optional
+
+from pydantic import TypeAdapter
 
 # --- Project Imports ---
+from ..core import json_fast
+from ..core.compression import compress_text, decompress_text
 from ..core.config import settings
 from ..schemas import (
-    DialogueTurn, 
+    DialogueTurn,
     SegmentInfo
 )
 # Session TimeOUt
 SESSION_TTL = settings.session_ttl
+# Re-sending EXPIRE for a key whose TTL was refreshed moments ago is
+# wasted traffic; touch again only after a quarter of the TTL elapses.
+TTL_TOUCH_INTERVAL = SESSION_TTL / 4
+
+# key -> monotonic time of the last EXPIRE we sent for it. Module level
+# because repositories are built per task/request — instance state would
+# start empty every time and never skip a refresh.
+_ttl_touched: Dict[str, float] = {}
+# Prune threshold so abandoned sessions don't accumulate entries forever
+_TTL_TOUCH_MAX = 4096
+
+def _should_touch(key: str) -> bool:
+    """
+    Returns True (and records the touch) if 'key' is due a TTL refresh,
+    i.e. we haven't sent an EXPIRE for it within TTL_TOUCH_INTERVAL.
+    """
+    now = time.monotonic()
+    if now - _ttl_touched.get(key, 0.0) <= TTL_TOUCH_INTERVAL:
+        return False
+    if len(_ttl_touched) >= _TTL_TOUCH_MAX:
+        cutoff = now - TTL_TOUCH_INTERVAL
+        for k, touched in list(_ttl_touched.items()):
+            if touched < cutoff:
+                del _ttl_touched[k]
+    _ttl_touched[key] = now
+    return True
+
+# Module-level adapters: the serializer core is built once at import, so
+# per-call serialization is a single Rust dump with no schema rebuild.
+# dump_json returns bytes, which redis-py accepts directly.
+_TURN_ADAPTER = TypeAdapter(DialogueTurn)
+_SEG_ADAPTER = TypeAdapter(SegmentInfo)
+# Batch validator: N stored turns validate in ONE Rust call instead of N
+# model_validate_json dispatches (the items are already valid JSON, so
+# joining them into an array is pure string work).
+_TURN_LIST_ADAPTER = TypeAdapter(List[DialogueTurn])
+
+def _validate_turns(raw_list) -> List[DialogueTurn]:
+    if not raw_list:
+        return []
+    return _TURN_LIST_ADAPTER.validate_json("[" + ",".join(raw_list) + "]")
+
+# INCR + EXPIRE as one server-side script: the counter bump and TTL
+# refresh land in a single EVALSHA instead of two commands.
+_INCR_EXPIRE_LUA = """
+local v = redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return v
+"""
 
 def get_dialogue_key(session_id: str) -> str:
     return f"session:{session_id}:history"
@@ -26,11 +79,26 @@ class ConversationRepositorySync:
     """
     Synchronous wrapper for ConversationService.
     Used in non-async contexts.
+
+    Write methods accept an optional 'pipe': when given, commands are
+    queued on it and the caller executes once — so a whole chunk's writes
+    share a single round-trip (see flush_chunk).
     """
     def __init__(self, redis_client):
         self.redis_client = redis_client.get_instance()
-    
-    def add_dialogue_turns(self, session_id: str, turns: List[DialogueTurn]):
+        # SHA cached after first call; reloaded transparently on NOSCRIPT
+        self._incr_expire = self.redis_client.register_script(_INCR_EXPIRE_LUA)
+
+    def _maybe_expire(self, pipe, key: str):
+        """
+        Queues an EXPIRE only if this key hasn't been touched within
+        TTL_TOUCH_INTERVAL — append-heavy sessions skip the redundant
+        refresh on almost every write.
+        """
+        if _should_touch(key):
+            pipe.expire(key, SESSION_TTL)
+
+    def add_dialogue_turns(self, session_id: str, turns: List[DialogueTurn], pipe=None):
         """
         Appends new dialogue turns to the session history.
         """
@@ -39,43 +107,54 @@ class ConversationRepositorySync:
 
         key = get_dialogue_key(session_id)
 
-        # Serialize Pydantic objects to JSON strings
+        # Serialize Pydantic objects to JSON bytes via the cached adapter
         # Redis rpush accepts multiple arguments, so we unpack the list
-        turn_data = [turn.model_dump_json() for turn in turns]
-        
-        self.redis_client.rpush(key, *turn_data)
-        
-        # Reset Expiration (Extend session life)
-        self.redis_client.expire(key, SESSION_TTL)        
+        turn_data = [_TURN_ADAPTER.dump_json(turn) for turn in turns]
+
+        conn = pipe if pipe is not None else self.redis_client.pipeline(transaction=False)
+        conn.rpush(key, *turn_data)
+        # Reset Expiration (Extend session life) — skipped if recently touched
+        self._maybe_expire(conn, key)
+        if pipe is None:
+            conn.execute()
 
-    def get_dialogue_history(self, session_id: str) -> List[DialogueTurn]:
+    def get_dialogue_history(self, session_id: str, since: int = 0) -> List[DialogueTurn]:
         """
-        Retrieves the full dialogue history for a session.
+        Retrieves the dialogue history for a session.
+        Callers that already hold the first 'since' turns fetch only the
+        tail, so transfer and parse cost track new turns, not total length.
         """
         key = get_dialogue_key(session_id)
 
-        # Range 0 to -1 means "everything"
-        raw_list = self.redis_client.lrange(key, 0, -1)
-        
-        # Deserialize JSON strings back to Pydantic objects
-        return [DialogueTurn.model_validate_json(item) for item in raw_list]
-    
-    def add_ui_segments(self, session_id: str, segments: List[SegmentInfo]):
+        # Range since to -1; default 0 means "everything"
+        raw_list = self.redis_client.lrange(key, since, -1)
+
+        # Deserialize the whole batch in one validator call
+        return _validate_turns(raw_list)
+
+    def add_ui_segments(self, session_id: str, segments: List[SegmentInfo], pipe=None):
         """
         Appends raw UI segments (rich metadata like red underlines) to Redis.
         These are used by the frontend for real-time rendering.
         """
         if not segments:
             return
-        
+
         key = get_ui_transcript_key(session_id)
 
-        # Serialize to JSON strings
-        serialized_segs = [segment.model_dump_json() for segment in segments]
-            
-        self.redis_client.rpush(key, *serialized_segs)
-        self.redis_client.expire(key, SESSION_TTL)
-    
+        # Serialize via the cached adapter; long segments are zstd-compressed
+        # (prefixed, so legacy plain-JSON entries still read back fine)
+        serialized_segs = [
+            compress_text(_SEG_ADAPTER.dump_json(segment))
+            for segment in segments
+        ]
+
+        conn = pipe if pipe is not None else self.redis_client.pipeline(transaction=False)
+        conn.rpush(key, *serialized_segs)
+        self._maybe_expire(conn, key)
+        if pipe is None:
+            conn.execute()
+
 
     def get_expected_chunk_index(self, session_id: str) -> int:
         """
@@ -84,24 +163,55 @@ class ConversationRepositorySync:
         """
 
         key = get_next_chunk_key(session_id)
-        
+
         value = self.redis_client.get(key)
-        
+
         if value is None:
             return 0
         return int(value)
-    
-    def increment_expected_chunk_index(self, session_id: str):
+
+    def increment_expected_chunk_index(self, session_id: str, pipe=None):
         """
         Increments the expected chunk index by 1.
         Called by the worker after successfully processing a chunk.
+        When queued on a caller's pipe, returns None (result arrives with
+        the caller's execute()).
+        """
+        key = get_next_chunk_key(session_id)
+
+        if pipe is not None:
+            pipe.incr(key)
+            self._maybe_expire(pipe, key)
+            return None
+
+        # Atomic INCR + EXPIRE in one EVALSHA, or a plain INCR when the
+        # TTL was refreshed recently enough to skip
+        if _should_touch(key):
+            return int(self._incr_expire(keys=[key], args=[SESSION_TTL]))
+        return int(self.redis_client.incr(key))
+
+    def flush_chunk(
+        self,
+        session_id: str,
+        turns: Optional[List[DialogueTurn]] = None,
+        segments: Optional[List[SegmentInfo]] = None,
+        increment_index: bool = False,
+    ):
+        """
+        Writes everything a processed chunk produces — history turns, UI
+        segments, and the expected-index bump — in ONE pipelined round-trip
+        instead of up to six.
         """
-        key = get_next_chunk_key(session_id)        
-        next_chunk_index = self.redis_client.incr(key)
-        self.redis_client.expire(key, SESSION_TTL)
+        pipe = self.redis_client.pipeline(transaction=False)
+        if turns:
+            self.add_dialogue_turns(session_id, turns, pipe=pipe)
+        if segments:
+            self.add_ui_segments(session_id, segments, pipe=pipe)
+        if increment_index:
+            self.increment_expected_chunk_index(session_id, pipe=pipe)
+        if len(pipe):
+            pipe.execute()
 
-        return next_chunk_index
-    
 class ConversationRepositoryAsync:
     """
     Asynchronous wrapper for ConversationService.
@@ -109,45 +219,83 @@ class ConversationRepositoryAsync:
     """
     def __init__(self, redis_client):
         self.redis_client = redis_client.get_instance()
+        self._incr_expire = self.redis_client.register_script(_INCR_EXPIRE_LUA)
 
-    async def get_dialogue_history(self, session_id: str) -> List[DialogueTurn]:
+    async def get_dialogue_history(self, session_id: str, since: int = 0) -> List[DialogueTurn]:
         """
-        Retrieves the full dialogue history for a session.
+        Retrieves the dialogue history for a session, starting at 'since'
+        (pass the count already held to fetch only new turns).
         """
         key = get_dialogue_key(session_id)
 
-        # Range 0 to -1 means "everything"
-        raw_list = await self.redis_client.lrange(key, 0, -1)
-        
-        # Deserialize JSON strings back to Pydantic objects
-        return [DialogueTurn.model_validate_json(item) for item in raw_list]
+        # Range since to -1; default 0 means "everything"
+        raw_list = await self.redis_client.lrange(key, since, -1)
+
+        # Deserialize the whole batch in one validator call
+        return _validate_turns(raw_list)
 
-    async def get_ui_segments(self, session_id: str) -> List[Dict[str, Any]]:
+    async def get_dialogue_history_raw(self, session_id: str, since: int = 0) -> List[str]:
         """
-        Retrieves the full list of UI segments for the frontend.
+        Returns the stored turns as raw JSON strings. For consumers that
+        ship the turns straight back out (HTTP responses, Celery payloads)
+        the parse + Pydantic revalidation of the typed getter is pure
+        waste — the list entries are already valid DialogueTurn JSON.
+        """
+        key = get_dialogue_key(session_id)
+        return await self.redis_client.lrange(key, since, -1)
+
+    async def get_dialogue_history_json(self, session_id: str) -> bytes:
+        """
+        Whole history as one JSON array (bytes), ready to hand to a
+        Response(media_type='application/json') without re-serializing.
+        """
+        raw_list = await self.get_dialogue_history_raw(session_id)
+        return ("[" + ",".join(raw_list) + "]").encode()
+
+    async def get_history_delta(self, session_id: str, since: int = 0):
+        """
+        Incremental fetch for polling clients: returns (total_length,
+        new_turns_from_since) in ONE pipelined round-trip, so the caller
+        can both render the delta and know its next 'since' cursor.
+        """
+        key = get_dialogue_key(session_id)
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.llen(key)
+        pipe.lrange(key, since, -1)
+        total, raw_list = await pipe.execute()
+
+        return total, _validate_turns(raw_list)
+
+    async def get_ui_segments(self, session_id: str, since: int = 0) -> List[Dict[str, Any]]:
+        """
+        Retrieves UI segments for the frontend from 'since' onward
+        (default: everything).
         """
         key = get_ui_transcript_key(session_id)
-        
-        # Get all items (0 to -1)
-        raw_data = await self.redis_client.lrange(key, 0, -1)
 
-        # Deserialize JSON strings back to dicts
-        return [json.loads(seg) for seg in raw_data]
+        # Get items from since to the tail
+        raw_data = await self.redis_client.lrange(key, since, -1)
+
+        # Deserialize (decompressing any zstd-prefixed entries) back to dicts
+        return [json_fast.loads(decompress_text(seg)) for seg in raw_data]
 
     async def get_next_chunk_index(self, session_id: str) -> int:
         """
-        Atomically increments the chunk counter and returns the 0-based index 
+        Atomically increments the chunk counter and returns the 0-based index
         for the chunk currently being processed.
-        
+
         This should be called by the API endpoint before calling TranscriberService.
         """
         key = get_chunk_count_key(session_id)
-        
-        # INCR atomically increments the value (1, 2, 3, ...)
-        # It returns the *new* count (1-based).
-        new_count = await self.redis_client.incr(key)
-        await self.redis_client.expire(key, SESSION_TTL)
-        
+
+        # INCR atomically increments the value (1, 2, 3, ...); the script
+        # refreshes the TTL in the same EVALSHA unless it was touched
+        # recently enough to skip.
+        if _should_touch(key):
+            new_count = int(await self._incr_expire(keys=[key], args=[SESSION_TTL]))
+        else:
+            new_count = int(await self.redis_client.incr(key))
+
         # We return the 0-based index (0, 1, 2, ...)
         return new_count - 1
-    
\ No newline at end of file
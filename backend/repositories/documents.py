@@ -1,14 +1,29 @@
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from pydantic import TypeAdapter
 
 # --- Project Imports ---
 from ..core.config import settings
+from ..core.compression import compress_text, decompress_text
 from ..schemas import SOAPNote
+from .conversation import get_dialogue_key
 
 # Session TimeOUt
 SESSION_TTL = settings.session_ttl
 
-get_soap_note_key = lambda session_id: f"session:{session_id}:soap"
-get_draft_key = lambda session_id, task_type: f"session:{session_id}:{task_type}:draft"
+# Built once: dump_json emits utf-8 bytes directly, no str round-trip
+_SOAP_ADAPTER = TypeAdapter(SOAPNote)
+
+# Key builders sit on every hot endpoint; caching them means repeat calls
+# for the same session reuse one interned string instead of re-formatting.
+@lru_cache(maxsize=4096)
+def get_soap_note_key(session_id: str) -> str:
+    return f"session:{session_id}:soap"
+
+@lru_cache(maxsize=4096)
+def get_draft_key(session_id: str, task_type: str) -> str:
+    return f"session:{session_id}:{task_type}:draft"
 
 # Async Redis Document Service
 class DocumentServiceAsync:
@@ -25,9 +40,33 @@ class DocumentServiceAsync:
         data = await self.redis_client.get(key)
         
         if data:
-            return SOAPNote.model_validate_json(data)
+            return SOAPNote.model_validate_json(decompress_text(data))
         return None
 
+    async def get_generation_context(self, session_id: str) -> Tuple[List[str], Optional[str]]:
+        """
+        Fetches the raw dialogue history and the raw SOAP note JSON in one
+        pipelined round-trip — the document-generation endpoint needs both
+        and was paying two RTTs for them.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lrange(get_dialogue_key(session_id), 0, -1)
+        pipe.get(get_soap_note_key(session_id))
+        history, raw_soap = await pipe.execute()
+
+        return history, decompress_text(raw_soap) if raw_soap else None
+
+    async def get_soap_note_json(self, session_id: str) -> Optional[str]:
+        """
+        Returns the stored SOAP note as its raw JSON string. For callers
+        that forward the note verbatim (Celery payloads), this skips the
+        validate-then-re-dump round-trip of the typed getter.
+        """
+        key = get_soap_note_key(session_id)
+
+        data = await self.redis_client.get(key)
+        return decompress_text(data) if data else None
+
     async def get_text_draft(self, session_id: str, task_type: str) -> Optional[str]:
         """
         Retrieves a plain text draft.
@@ -50,8 +89,8 @@ class DocumentServiceSync:
         """
         key = get_soap_note_key(session_id)
 
-        # Save as JSON string
-        self.redis_client.set(key, note.model_dump_json(), ex=SESSION_TTL)
+        # Save as JSON bytes (zstd-compressed once the note grows large)
+        self.redis_client.set(key, compress_text(_SOAP_ADAPTER.dump_json(note)), ex=SESSION_TTL)
 
     def get_soap_note(self, session_id: str) -> Optional[SOAPNote]:
         """
@@ -62,7 +101,7 @@ class DocumentServiceSync:
         data = self.redis_client.get(key)
         
         if data:
-            return SOAPNote.model_validate_json(data)
+            return SOAPNote.model_validate_json(decompress_text(data))
         return None
 
     def save_text_draft(self, session_id: str, task_type: str, raw_text: str):
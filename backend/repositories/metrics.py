@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional, Dict, Union
 
 # --- Project Imports ---
@@ -6,7 +7,46 @@ from ..core.logger import logger
 
 # Session TimeOUt
 SESSION_TTL = settings.session_ttl
-get_metrics_key = lambda session_id: f"session:{session_id}:metrics"
+
+@lru_cache(maxsize=4096)
+def get_metrics_key(session_id: str) -> str:
+    return f"session:{session_id}:metrics"
+
+# Any feedback action touches up to four counters plus the TTL; as one
+# registered Lua script every variant lands atomically in a single
+# EVALSHA. ARGV[1]/[2] carry similarity+distance for edits ('' skips),
+# ARGV[3] names a plain counter field to bump ('' skips), ARGV[4] = TTL.
+_FEEDBACK_STATS_LUA = """
+local k = KEYS[1]
+redis.call('HINCRBY', k, 'feedback_indc', 1)
+if ARGV[1] ~= '' then
+  redis.call('HINCRBYFLOAT', k, 'total_similarity', ARGV[1])
+  redis.call('HINCRBY', k, 'total_edit_distance', ARGV[2])
+  redis.call('HINCRBY', k, 'edit_count', 1)
+elseif ARGV[3] ~= '' then
+  redis.call('HINCRBY', k, ARGV[3], 1)
+end
+return redis.call('EXPIRE', k, ARGV[4])
+"""
+
+def parse_redis_value(v: Union[str, int, float]) -> Union[int, float, str]:
+    """Intelligently convert a Redis string to int or float."""
+    # RESP3 can hand numbers back already typed
+    if isinstance(v, (int, float)):
+        return v
+
+    # Fast path: plain (signed) integer string, no exception machinery.
+    # Counters are the overwhelmingly common case on this hash.
+    if v.isdigit() or (v[:1] == '-' and v[1:].isdigit()):
+        return int(v)
+
+    try:
+        f_val = float(v)
+    except (ValueError, TypeError):
+        return v  # If not a number, return as string
+
+    # If it's a whole number like 3.0, convert to int; otherwise keep as float like 3.5
+    return int(f_val) if f_val.is_integer() else f_val
 
 class MetricsServiceSync:
     """
@@ -32,24 +72,56 @@ class MetricsServiceSync:
 
         key = get_metrics_key(session_id)
 
+        # Queue every increment plus the TTL refresh on one pipeline:
+        # K metric fields cost one round-trip instead of K+1
+        pipe = self.redis_client.pipeline(transaction=False)
+
         if isinstance(metrics, dict):
             # Iterate over each metric (e.g., matched_count, transcript_count) and increment
             # This adds the new values to the existing totals automatically.
             for f, v in metrics.items():
-                if v != 0: 
+                if v != 0:
                     if isinstance(v, float):
-                        self.redis_client.hincrbyfloat(key, f, v)
+                        pipe.hincrbyfloat(key, f, v)
                     elif isinstance(v, int):
-                        self.redis_client.hincrby(key, f, v)
-        
+                        pipe.hincrby(key, f, v)
+
         elif field:
             if isinstance(metrics, int):
-                self.redis_client.hincrby(key, field, metrics)
+                pipe.hincrby(key, field, metrics)
             elif isinstance(metrics, float):
-                self.redis_client.hincrbyfloat(key, field, metrics)
+                pipe.hincrbyfloat(key, field, metrics)
 
         # Refresh TTL for the metrics key as well
-        self.redis_client.expire(key, SESSION_TTL)
+        pipe.expire(key, SESSION_TTL)
+        pipe.execute()
+
+    def update_metrics_typed(
+        self,
+        session_id: str,
+        ints: Optional[Dict[str, int]] = None,
+        floats: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Typed fast path: callers that know their counters' types pass them
+        in separate int/float lanes, so the per-field isinstance dispatch
+        of update_metrics disappears. Everything lands in one pipeline.
+        """
+        if not ints and not floats:
+            return
+
+        key = get_metrics_key(session_id)
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        for f, v in (ints or {}).items():
+            if v != 0:
+                pipe.hincrby(key, f, v)
+        for f, v in (floats or {}).items():
+            if v != 0:
+                pipe.hincrbyfloat(key, f, v)
+
+        pipe.expire(key, SESSION_TTL)
+        pipe.execute()
 
 class MetricsServiceAsync:
     """
@@ -58,15 +130,8 @@ class MetricsServiceAsync:
     """
     def __init__(self, redis_client):
         self.redis_client = redis_client.get_instance()
-    
-    def _parse_redis_value(self, v: str) -> Union[int, float, str]:
-        """Intelligently convert Redis string to int or float"""
-        try:
-            f_val = float(v)
-            # If it's a whole number like 3.0, convert to int; otherwise keep as float like 3.5
-            return int(f_val) if f_val.is_integer() else f_val
-        except (ValueError, TypeError):
-            return v  # If not a number, return as string
+        # SHA cached after first call; reloaded transparently on NOSCRIPT
+        self._stats_script = self.redis_client.register_script(_FEEDBACK_STATS_LUA)
 
     async def get_metrics(self, session_id: str) -> Dict[str, int]:
         """
@@ -79,7 +144,7 @@ class MetricsServiceAsync:
         
         # Redis returns dict values as strings, so we convert them back to integers
         # Example: {'hallucination_count': '2'} -> {'hallucination_count': 2}
-        return {k: self._parse_redis_value(v) for k, v in data.items()}
+        return {k: parse_redis_value(v) for k, v in data.items()}
             
     async def update_feedback_stats(self, session_id: str, similarity: Optional[float], distance: Optional[int], action: str):
         """
@@ -87,21 +152,14 @@ class MetricsServiceAsync:
         """
         key = get_metrics_key(session_id)
 
-        # 1. Indicator that feedback received.
-        await self.redis_client.hincrby(key, "feedback_indc", 1)
-        
-        # 2. Rating accumulation
-        if action == "accept":
-            await self.redis_client.hincrby(key, "accept_count", 1)
-        elif action == "reject":
-            await self.redis_client.hincrby(key, "reject_count", 1)
-        elif action == "edit":
-            if similarity is not None and distance is not None:
-                await self.redis_client.hincrbyfloat(key, "total_similarity", similarity)
-                await self.redis_client.hincrby(key, "total_edit_distance", distance)
-                await self.redis_client.hincrby(key, "edit_count", 1)
-            else:
-                logger.warning(f"⚠️ Edit feedback received without metrics for session {session_id}")
-            
-        # Refresh TTL
-        await self.redis_client.expire(key, SESSION_TTL)
+        # One EVALSHA regardless of action: the script bumps the feedback
+        # indicator, the action's counters, and the TTL atomically.
+        if action == "edit" and similarity is not None and distance is not None:
+            await self._stats_script(keys=[key], args=[similarity, distance, "", SESSION_TTL])
+            return
+
+        if action == "edit":
+            logger.warning(f"⚠️ Edit feedback received without metrics for session {session_id}")
+
+        counter_field = {"accept": "accept_count", "reject": "reject_count"}.get(action, "")
+        await self._stats_script(keys=[key], args=["", 0, counter_field, SESSION_TTL])
@@ -1,8 +1,17 @@
-import json
 from datetime import datetime
 from typing import List, Optional, Dict, Any
 
+# Local timezone resolved once: astimezone() per call re-queries tzdata
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+# HSET + EXPIRE as one server-side command (same pattern as the buffer)
+_HSET_EXPIRE_LUA = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+return redis.call('EXPIRE', KEYS[1], ARGV[3])
+"""
+
 # --- Project Imports ---
+from ..core import json_fast
 from ..core.config import settings
 
 # Session TimeOUt
@@ -14,6 +23,23 @@ def get_warnings_key(session_id: str) -> str:
 def get_safety_key(session_id: str) -> str:
     return f"session:{session_id}:safety"
 
+def get_notification_channel(session_id: str) -> str:
+    # Pub/Sub channel for server-push notifications (WebSocket subscribers)
+    return f"notif:{session_id}"
+
+def get_poll_streak_key(session_id: str) -> str:
+    return f"session:{session_id}:poll_streak"
+
+def _parse_json_values(values) -> List[Dict[str, Any]]:
+    # Shared lenient decode: malformed entries are skipped, not fatal
+    parsed = []
+    for raw_item in values:
+        try:
+            parsed.append(json_fast.loads(raw_item))
+        except ValueError:
+            continue
+    return parsed
+
 class NotificationServiceAsync:
     """
     Manages session state (Dialogue History & SOAP Note) using Redis.
@@ -22,6 +48,48 @@ class NotificationServiceAsync:
     def __init__(self, redis_client):
         self.redis_client = redis_client.get_instance()
 
+    async def get_all(self, session_id: str, chunk_index: Optional[int] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetches warnings AND safety alerts in ONE pipelined round-trip —
+        the polling endpoint needs both every time, and two independent
+        awaits paid two RTTs per poll.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        if chunk_index is not None:
+            pipe.hget(get_warnings_key(session_id), str(chunk_index))
+        else:
+            pipe.hgetall(get_warnings_key(session_id))
+        pipe.hgetall(get_safety_key(session_id))
+        raw_warnings, raw_safety = await pipe.execute()
+
+        if chunk_index is not None:
+            warning_values = [raw_warnings] if raw_warnings else []
+        else:
+            warning_values = (raw_warnings or {}).values()
+
+        return {
+            "warnings": _parse_json_values(warning_values),
+            "safety_alerts": _parse_json_values((raw_safety or {}).values()),
+        }
+
+    async def bump_poll_streak(self, session_id: str, empty: bool) -> int:
+        """
+        Tracks consecutive empty polls for the backoff hint. An empty poll
+        increments the streak (TTL-bounded); any delivered notification
+        resets it so the client snaps back to fast polling.
+        """
+        key = get_poll_streak_key(session_id)
+
+        if not empty:
+            await self.redis_client.unlink(key)
+            return 0
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, SESSION_TTL)
+        streak, _ = await pipe.execute()
+        return int(streak)
+
     async def get_warnings(self, session_id: str, chunk_index: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Retrieves warnings from Redis.
@@ -46,8 +114,8 @@ class NotificationServiceAsync:
             
             if raw_item:
                 try:
-                    parsed_notifications.append(json.loads(raw_item))
-                except json.JSONDecodeError:
+                    parsed_notifications.append(json_fast.loads(raw_item))
+                except ValueError:
                     pass
         else:
             # Case 2: Fetch ALL (Sync Mode)
@@ -60,8 +128,8 @@ class NotificationServiceAsync:
                 
             for _, raw_item in all_items.items():
                 try:
-                    parsed_notifications.append(json.loads(raw_item))
-                except json.JSONDecodeError:
+                    parsed_notifications.append(json_fast.loads(raw_item))
+                except ValueError:
                     continue
         
         # Note: We do NOT delete items here (Persistence).
@@ -86,8 +154,8 @@ class NotificationServiceAsync:
                 
             for _, raw_item in all_items.items():
                 try:
-                    parsed_alerts.append(json.loads(raw_item))
-                except json.JSONDecodeError:
+                    parsed_alerts.append(json_fast.loads(raw_item))
+                except ValueError:
                     continue
         else:
             field = str(chunk_index)
@@ -97,8 +165,8 @@ class NotificationServiceAsync:
                 return []
 
             try:
-                parsed_alerts.append(json.loads(raw_item))        
-            except json.JSONDecodeError:
+                parsed_alerts.append(json_fast.loads(raw_item))        
+            except ValueError:
                 pass
 
         return parsed_alerts
@@ -111,7 +179,8 @@ class NotificationServiceSync:
     """
     def __init__(self, redis_client):
         self.redis_client = redis_client.get_instance()
-
+        # SHA cached after first call; reloaded transparently on NOSCRIPT
+        self._hset_expire = self.redis_client.register_script(_HSET_EXPIRE_LUA)
 
     def add_warning(self, session_id: str, warnings: List[str], chunk_index: int):
         """
@@ -129,14 +198,59 @@ class NotificationServiceSync:
         # Construct structured data with Timezone-Aware Timestamp
         notification_data = {
             "chunk_index": chunk_index,
-            # Use astimezone() to include timezone info (e.g., +09:00), safer than naive now()
-            "timestamp": datetime.now().astimezone().isoformat(),
+            # Timezone-aware (e.g., +09:00) via the cached local tz, safer than naive now()
+            "timestamp": datetime.now(_LOCAL_TZ).isoformat(),
             "warnings": warnings
         }
         
         # O(1) Operation: Map chunk_index (field) to the warning data (value)
-        self.redis_client.hset(key, str(chunk_index), json.dumps(notification_data))
-        self.redis_client.expire(key, SESSION_TTL)
+        # Script (write + TTL) and the live-subscriber publish share one
+        # pipelined round-trip. Polling stays as a fallback.
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._hset_expire(
+            keys=[key],
+            args=[str(chunk_index), json_fast.dumps(notification_data), SESSION_TTL],
+            client=pipe,
+        )
+        pipe.publish(
+            get_notification_channel(session_id),
+            json_fast.dumps({"type": "warning", **notification_data})
+        )
+        pipe.execute()
+
+    def add_warnings_batch(self, session_id: str, items: Dict[int, List[str]]):
+        """
+        Saves warnings for several chunks at once (e.g., from a retrying
+        worker catching up). One multi-field HSET plus the TTL refresh and
+        per-chunk pub/sub pushes, all on a single pipelined round-trip —
+        N add_warning calls would pay 2N.
+        """
+        if not items:
+            return
+
+        key = get_warnings_key(session_id)
+        channel = get_notification_channel(session_id)
+        timestamp = datetime.now(_LOCAL_TZ).isoformat()
+
+        mapping = {}
+        pipe = self.redis_client.pipeline(transaction=False)
+        for chunk_index, warnings in items.items():
+            if not warnings:
+                continue
+            notification_data = {
+                "chunk_index": chunk_index,
+                "timestamp": timestamp,
+                "warnings": warnings
+            }
+            mapping[str(chunk_index)] = json_fast.dumps(notification_data)
+            pipe.publish(channel, json_fast.dumps({"type": "warning", **notification_data}))
+
+        if not mapping:
+            return
+
+        pipe.hset(key, mapping=mapping)
+        pipe.expire(key, SESSION_TTL)
+        pipe.execute()
 
     def add_safety_alert(self, session_id: str, alerts: List[str], chunk_index: int):
         """
@@ -153,10 +267,20 @@ class NotificationServiceSync:
         
         alert_data = {
             "chunk_index": chunk_index,
-            "timestamp": datetime.now().astimezone().isoformat(),
+            "timestamp": datetime.now(_LOCAL_TZ).isoformat(),
             "alerts": alerts
         }
         
-        # Save to Redis
-        self.redis_client.hset(key, str(chunk_index), json.dumps(alert_data))
-        self.redis_client.expire(key, SESSION_TTL)
\ No newline at end of file
+        # Save to Redis: script (write + TTL) and the live-subscriber
+        # publish share one pipelined round-trip. Polling stays as a fallback.
+        pipe = self.redis_client.pipeline(transaction=False)
+        self._hset_expire(
+            keys=[key],
+            args=[str(chunk_index), json_fast.dumps(alert_data), SESSION_TTL],
+            client=pipe,
+        )
+        pipe.publish(
+            get_notification_channel(session_id),
+            json_fast.dumps({"type": "safety_alert", **alert_data})
+        )
+        pipe.execute()
\ No newline at end of file
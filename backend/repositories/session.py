@@ -1,19 +1,48 @@
 import json
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 
 # --- Project Imports ---
+from ..core import json_fast
+from ..core.compression import decompress_text
 from ..core.config import settings
+from ..schemas import SessionBootstrap, SOAPNote
+# Sibling repositories own the key layout and deserializers; reusing them
+# keeps the bootstrap fetch in lockstep with the per-endpoint getters.
+from .buffer import get_buffer_key
+from .conversation import (
+    get_dialogue_key,
+    get_ui_transcript_key,
+    get_chunk_count_key,
+    get_next_chunk_key,
+    _validate_turns,
+)
+from .documents import get_soap_note_key, get_draft_key
+from .metrics import get_metrics_key, parse_redis_value
+from .notification import get_warnings_key, get_safety_key, get_poll_streak_key
+from ..prompts import SUFFIX_REGISTRY
 import hashlib
 
 # Session TimeOUt
 SESSION_TTL = settings.session_ttl
 
+# Local timezone resolved once: astimezone() per call re-queries tzdata
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
+@lru_cache(maxsize=4096)
 def hash_mrn(mrn: str) -> str:
     """Hash MRN using SHA-256 for secure storage."""
-    return hashlib.sha256(mrn.encode()).hexdigest()[:32]
+    # Process-local memo only: repeat hashes of the same MRN across the
+    # create/ingest/feedback paths become dict hits. Never persisted.
+    # digest()[:16].hex() formats only the 16 bytes we keep, instead of
+    # rendering the full 64-char hexdigest and throwing half away.
+    # hashlib rides OpenSSL, which picks the SHA-NI path on capable CPUs.
+    return hashlib.sha256(mrn.encode()).digest()[:16].hex()
 
-get_metadata_key = lambda session_id: f"session:{session_id}:metadata"
+@lru_cache(maxsize=4096)
+def get_metadata_key(session_id: str) -> str:
+    return f"session:{session_id}:metadata"
 
 class SessionRepositoryAsync:
     """
@@ -32,11 +61,14 @@ class SessionRepositoryAsync:
         metadata = {
             "doctor_id": doctor_id,
             "patient_id": hash_mrn(mrn),
-            "session_start": datetime.now().astimezone().isoformat()
+            "session_start": datetime.now(_LOCAL_TZ).isoformat()
         }
 
-        await self.redis_client.hset(key, mapping=metadata)
-        await self.redis_client.expire(key, SESSION_TTL)
+        # HSET + EXPIRE share one pipelined round-trip instead of two awaits
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hset(key, mapping=metadata)
+        pipe.expire(key, SESSION_TTL)
+        await pipe.execute()
 
         return session_id
 
@@ -53,19 +85,62 @@ class SessionRepositoryAsync:
 
         return raw_metadata    
 
+    async def load_session_bootstrap(self, session_id: str) -> SessionBootstrap:
+        """
+        Fetches everything a freshly opened conversation view needs —
+        history, UI segments, SOAP note, metrics, warnings and safety
+        alerts — in ONE pipelined round-trip instead of six separate calls.
+        """
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.lrange(get_dialogue_key(session_id), 0, -1)
+        pipe.lrange(get_ui_transcript_key(session_id), 0, -1)
+        pipe.get(get_soap_note_key(session_id))
+        pipe.hgetall(get_metrics_key(session_id))
+        pipe.hgetall(get_warnings_key(session_id))
+        pipe.hgetall(get_safety_key(session_id))
+        raw_turns, raw_segs, raw_soap, raw_metrics, raw_warnings, raw_safety = await pipe.execute()
+
+        def parse_hash(items):
+            parsed = []
+            for _, raw_item in items.items():
+                try:
+                    parsed.append(json_fast.loads(raw_item))
+                except ValueError:
+                    continue
+            return parsed
+
+        return SessionBootstrap(
+            history=_validate_turns(raw_turns),
+            ui_segments=[json_fast.loads(decompress_text(seg)) for seg in raw_segs],
+            soap_note=SOAPNote.model_validate_json(decompress_text(raw_soap)) if raw_soap else None,
+            metrics={k: parse_redis_value(v) for k, v in raw_metrics.items()},
+            warnings=parse_hash(raw_warnings),
+            safety_alerts=parse_hash(raw_safety),
+        )
+
     async def clear_session(self, session_id: str):
         """
         Completely wipes ALL data related to a session.
-        Uses SCAN to find all keys matching 'session:{id}:*' instead of a hardcoded list.
+
+        Every 'session:{id}:*' key comes from a repository key builder, so
+        the full set is known without touching the keyspace: one UNLINK
+        over the derived list replaces the SCAN sweep (which walked the
+        ENTIRE keyspace per session). UNLINK frees values on a background
+        Redis thread, and deleting absent keys is a harmless no-op.
         """
-        pattern = f"session:{session_id}:*"
-        
-        # 1. Find all keys belonging to this session
-        # scan_iter is non-blocking and efficient for finding matching keys
-        keys_to_delete = [key async for key in self.redis_client.scan_iter(match=pattern)]
-        
-        # 2. Delete them all in one go
-        if keys_to_delete:
-            await self.redis_client.delete(*keys_to_delete)
-            # Optional: Log strictly for debugging
-            # print(f"🧹 Cleared session {session_id}. Deleted keys: {keys_to_delete}")
+        keys = [
+            get_metadata_key(session_id),
+            get_dialogue_key(session_id),
+            get_ui_transcript_key(session_id),
+            get_chunk_count_key(session_id),
+            get_next_chunk_key(session_id),
+            get_buffer_key(session_id),
+            get_soap_note_key(session_id),
+            get_metrics_key(session_id),
+            get_warnings_key(session_id),
+            get_safety_key(session_id),
+            get_poll_streak_key(session_id),
+        ]
+        keys.extend(get_draft_key(session_id, task) for task in SUFFIX_REGISTRY)
+
+        await self.redis_client.unlink(*keys)
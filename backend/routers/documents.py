@@ -1,6 +1,9 @@
+import asyncio
+from typing import List
+
 from fastapi import APIRouter, HTTPException, status, Depends
-from celery.result import AsyncResult
 # --- Project Imports ---
+from ..core import json_fast
 from ..core.celery_app import celery_app
 from ..core.logger import logger
 from ..core.redis_client import redis_client
@@ -18,7 +21,6 @@ def get_conversation_service() -> ConversationRepositoryAsync:
 async def generate_derived_document(
     session_id: str,
     task_type: str,
-    conversation_service: ConversationRepositoryAsync = Depends(get_conversation_service),
     document_service: DocumentServiceAsync = Depends(get_document_service)
 ):
     """
@@ -31,17 +33,19 @@ async def generate_derived_document(
         # Update Request Context
 
         # 1. Fetch Data
-        history = await conversation_service.get_dialogue_history(session_id)
-        current_soap = await document_service.get_soap_note(session_id)
+        # Raw JSON strings (the task payload wants exactly what Redis
+        # stores), both reads sharing a single pipelined round-trip
+        history, current_soap = await document_service.get_generation_context(session_id)
 
-        # 2. Celery Task
-        task = celery_app.send_task(
+        # 2. Celery Task (broker publish is blocking -> worker thread)
+        task = await asyncio.to_thread(
+            celery_app.send_task,
             "generate_document_task", # task 이름 (worker @task 데코레이터의 name과 일치해야 함)
             kwargs={
                 "session_id": session_id,
                 "task_type": task_type,
-                "history": [item.model_dump_json() for item in history],
-                "current_soap": current_soap.model_dump_json() if current_soap else None
+                "history": history,
+                "current_soap": current_soap
             }
         )
 
@@ -56,36 +60,66 @@ async def generate_derived_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/task_status/{task_id}")
-async def get_task_status(task_id: str):
-    task_result = AsyncResult(task_id, app=celery_app)
-    
-    # 1. When Celery is still processing or pending
-    # STARTED may not appear if not configured, but safe to include
-    if task_result.state in ['PENDING', 'STARTED', 'RETRY']:
+def _status_from_meta(raw_meta) -> dict:
+    """
+    Maps a raw celery-task-meta JSON blob (as stored by the Redis result
+    backend) to the API's status shape. Missing key == still pending.
+    """
+    # 1. No meta yet: pending / started / lost — treat as processing
+    if not raw_meta:
         return {"status": "processing"}
-        
+
+    try:
+        meta = json_fast.loads(raw_meta)
+    except ValueError:
+        return {"status": "processing"}
+
+    state = meta.get("status")
+
     # 2. When Celery reports task completion (success)
-    elif task_result.state == 'SUCCESS':
-        # Open the box
-        output = task_result.result 
-        
+    if state == "SUCCESS":
+        output = meta.get("result")
+
         # [Important] Check if the result content indicates failure
         # Catches cases where worker returned {"status": "failed"}
         if isinstance(output, dict) and output.get("status") == "failed":
-             return {
-                 "status": "failed",
-                 "error": output.get("error", "Unknown logic error")
-             }
-        
+            return {
+                "status": "failed",
+                "error": output.get("error", "Unknown logic error")
+            }
+
         # True success
         return {
             "status": "completed",
             "result": output # {"status": "success", "data": ...}
         }
-        
+
     # 3. When Celery task itself failed (e.g., OOM, code exceptions)
-    elif task_result.state == 'FAILURE':
-        return {"status": "failed", "error": str(task_result.info)}
-    
-    return {"status": "processing"} # Treat other states as processing
\ No newline at end of file
+    if state == "FAILURE":
+        return {"status": "failed", "error": str(meta.get("result"))}
+
+    return {"status": "processing"} # Treat other states as processing
+
+@router.get("/task_status/{task_id}")
+async def get_task_status(task_id: str):
+    # Read the backend meta key directly over the shared async client:
+    # no per-call AsyncResult construction, no sync backend round-trip
+    raw_meta = await redis_client.get_instance().get(f"celery-task-meta-{task_id}")
+    return _status_from_meta(raw_meta)
+
+@router.post("/task_status/batch")
+async def get_task_status_batch(task_ids: List[str]):
+    """
+    Status for many tasks in ONE Redis round-trip (MGET), for UIs polling
+    several generations at once — N single calls would pay N RTTs.
+    """
+    if not task_ids:
+        return {}
+
+    raw_metas = await redis_client.get_instance().mget(
+        [f"celery-task-meta-{task_id}" for task_id in task_ids]
+    )
+    return {
+        task_id: _status_from_meta(raw_meta)
+        for task_id, raw_meta in zip(task_ids, raw_metas)
+    }
\ No newline at end of file
@@ -1,6 +1,5 @@
-import json
 from typing import Optional
-from fastapi import APIRouter, Form, HTTPException, Depends
+from fastapi import APIRouter, BackgroundTasks, Form, HTTPException, Depends
 
 # --- Project Imports ---
 from ..core.logger import logger
@@ -11,6 +10,7 @@ from ..schemas import SOAPNote
 # Repositories
 from ..core.redis_client import redis_client
 from ..repositories.documents import DocumentServiceAsync
+from ..repositories.metrics import MetricsServiceAsync
 
 router = APIRouter()
 
@@ -20,8 +20,12 @@ def get_document_service() -> DocumentServiceAsync:
 def get_feedback_service() -> FeedbackService:
     return FeedbackService(redis_client)
 
-@router.post("/submit_feedback")
+def get_metrics_service() -> MetricsServiceAsync:
+    return MetricsServiceAsync(redis_client)
+
+@router.post("/submit_feedback", status_code=202)
 async def submit_human_feedback(
+    background_tasks: BackgroundTasks,
     session_id: str = Form(...),
     feedback_type: str = Form(...), # accept, reject, edit
     edited_content: str = Form(None), # JSON string or plain text
@@ -36,12 +40,12 @@ async def submit_human_feedback(
     logger.info(f"📝 Feedback received: {feedback_type} for session {session_id}")
     
     try:
-        # Parse edited content if it's a SOAP task (JSON string -> Dict)
-        parsed_content = json.loads(edited_content)
-        if parsed_content:
+        # Validate edited content if it's a SOAP task.
+        # model_validate_json fuses parse + validation into one C-level
+        # pass — no intermediate dict, no separate json.loads.
+        if edited_content:
             try:
-                # Validation
-                SOAPNote(**parsed_content)
+                SOAPNote.model_validate_json(edited_content)
             except Exception:
                 logger.warning("Feedback content is not valid JSON, saving as raw string.")
         
@@ -51,22 +55,34 @@ async def submit_human_feedback(
         # convert current_soap to string for original_output
         current_soap_str = current_soap.model_dump_json() if current_soap else ""
 
-        # Delegate to FeedbackService
-        # It handles fetching original output, context, metrics calculation, and routing.
-        metrics = await feedback_service.save_feedback(
+        # Delegate to FeedbackService AFTER the response is sent: the
+        # doctor only needs the ACK, while the Levenshtein similarity and
+        # training-record routing run as a background task off the P99
+        # path. Aggregated metrics land in Redis and are readable via
+        # /feedback_metrics (or the session bootstrap).
+        background_tasks.add_task(
+            feedback_service.save_feedback,
             session_id=session_id,
             task_type='soap', # For now only support soap
             original_output=current_soap_str,
             edited_output=edited_content,
             action=feedback_type
         )
-        
-        # Note: In our last discussion, we agreed to update save_feedback signature 
-        # to accept feedback_type. I will assume it's updated or we map it.
-        # For safety, let's assume we pass the raw params and service handles logic.
-        
-        return {"status": "success", "metrics": metrics}
+
+        return {"status": "accepted"}
 
     except Exception as e:
         logger.exception("❌ Error submitting feedback")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/feedback_metrics")
+async def get_feedback_metrics(
+    session_id: str,
+    metrics_service: MetricsServiceAsync = Depends(get_metrics_service)
+):
+    """
+    Returns the session's aggregated metrics (including feedback counters
+    written by the background save) for clients that want them after the
+    202 ACK from /submit_feedback.
+    """
+    return await metrics_service.get_metrics(session_id)
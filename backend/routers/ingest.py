@@ -1,19 +1,22 @@
-
+import contextlib
 import os
-import shutil
 import time
+
+import aiofiles
+import aiofiles.os
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends
 
 # --- Project Imports ---
+from ..core.config import settings
 from ..repositories.conversation import ConversationRepositoryAsync
 from ..repositories.documents import DocumentServiceAsync
 from ..core.logger import logger
-from ..core.celery_app import celery_app
+from ..core.celery_batcher import celery_batcher
 from ..core.redis_client import redis_client
 
 router = APIRouter()
 
-UPLOAD_DIR = "temp_audio_uploads"
+UPLOAD_DIR = settings.upload_dir
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 def get_conversation_service() -> ConversationRepositoryAsync:
@@ -41,16 +44,23 @@ async def ingest_audio_chunk(
     file_path = os.path.join(UPLOAD_DIR, filename)    
     
     try:
-        with open(file_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # Stream to disk without blocking the event loop: 1 MiB reads from
+        # the upload, async writes via aiofiles (shutil.copyfileobj would
+        # stall every other request for the duration of a multi-MB upload)
+        async with aiofiles.open(file_path, "wb") as buffer:
+            while chunk := await file.read(1 << 20):
+                await buffer.write(chunk)
             
         # 2. Get Chunk Index (Atomic Counter from Redis)
         # Required for data lineage (SOAPItem tracking)
         chunk_index = await conversation_service.get_next_chunk_index(session_id)
         logger.info(f"🎫 [Ingest] Assigned Ticket #{chunk_index} to Session {session_id}")
 
-        # 3. Celery Task        
-        celery_app.send_task(
+        # 3. Celery Task
+        # Batched publish: concurrent uploads share one producer and one
+        # broker flush instead of a round-trip per request (and the
+        # publish still happens off the event loop)
+        await celery_batcher.enqueue(
             "process_audio_chunk", # task 이름 (worker @task 데코레이터의 name과 일치해야 함)
             kwargs={
                 "file_path": file_path,
@@ -70,6 +80,7 @@ async def ingest_audio_chunk(
 
     except Exception as e:
         logger.exception("❌ Error in ingest_chunk pipeline")
-        if 'file_path' in locals() and os.path.exists(file_path):
-            os.remove(file_path)
+        # Cleanup off-loop; suppress instead of a racy exists() probe
+        with contextlib.suppress(FileNotFoundError):
+            await aiofiles.os.remove(file_path)
         raise HTTPException(status_code=500, detail=str(e))   
\ No newline at end of file
@@ -1,16 +1,18 @@
 import asyncio
+import random
 import uuid
 from typing import Optional
-from fastapi import APIRouter, Form, HTTPException, Depends
+from fastapi import APIRouter, Form, HTTPException, Depends, WebSocket, WebSocketDisconnect
 
 # --- Project Imports ---
+from ..core.celery_app import celery_app
 from ..core.logger import logger
 # Services
 from ..services.feedback_service import FeedbackService
 # Repositories
 from ..core.redis_client import redis_client
 from ..repositories.conversation import ConversationRepositoryAsync
-from ..repositories.notification import NotificationServiceAsync
+from ..repositories.notification import NotificationServiceAsync, get_notification_channel
 from ..repositories.documents import DocumentServiceAsync
 from ..repositories.session import SessionRepositoryAsync
 router = APIRouter()
@@ -41,25 +43,64 @@ async def check_notifications(
     - If chunk_index is sent: Checks only for that chunk (Fast).
     - If chunk_index is omitted: Checks all pending warnings.
     """
-    # Fetch from Redis Hash
-    results = await asyncio.gather(
-        notification_service.get_warnings(session_id, chunk_index),
-        notification_service.get_safety_alerts(session_id)
-    )
-    
-    warnings = results[0]
-    safety_alerts = results[1]
+    # Fetch from Redis Hash — both hashes on ONE pipelined round-trip
+    response = await notification_service.get_all(session_id, chunk_index)
 
-    response = {
-        "warnings": warnings,        # Frontend: Show generally (Yellow/Toast)
-        "safety_alerts": safety_alerts # Frontend: Show prominently (Red/Modal)
-    }
+    warnings = response["warnings"]          # Frontend: Show generally (Yellow/Toast)
+    safety_alerts = response["safety_alerts"] # Frontend: Show prominently (Red/Modal)
     
     if warnings or safety_alerts:
         logger.info(f"🔔 Retrieved notifications for {session_id}: {len(warnings)} warnings, {len(safety_alerts)} alerts")
-        
+
+    # Server-driven poll pacing: quiet sessions back off exponentially
+    # (250ms doubling to a 16s cap, plus jitter so pollers don't align);
+    # any hit resets the streak and the next hint snaps back to 250ms.
+    streak = await notification_service.bump_poll_streak(
+        session_id, empty=not (warnings or safety_alerts)
+    )
+    response["next_poll_ms"] = (
+        min(16_000, 250 * 2 ** max(0, streak - 1)) + random.randint(0, 100)
+    )
+
     return response
 
+@router.websocket("/ws/notifications/{session_id}")
+async def notifications_websocket(websocket: WebSocket, session_id: str):
+    """
+    Server-push alternative to polling /check_notifications.
+    Subscribes to the session's Redis pub/sub channel and forwards every
+    warning/safety alert to the client the moment the worker publishes it.
+    """
+    await websocket.accept()
+    logger.info(f"🔌 Notification WebSocket opened for session {session_id}")
+
+    pubsub = redis_client.get_instance().pubsub()
+    await pubsub.subscribe(get_notification_channel(session_id))
+
+    try:
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            # Payload is already a JSON string (written by the worker)
+            await websocket.send_text(message["data"])
+    except WebSocketDisconnect:
+        logger.info(f"🔌 Notification WebSocket closed for session {session_id}")
+    finally:
+        await pubsub.unsubscribe(get_notification_channel(session_id))
+        await pubsub.close()
+
+@router.get("/session_bootstrap")
+async def session_bootstrap(
+    session_id: str,
+    session_service: SessionRepositoryAsync = Depends(get_session_service)
+):
+    """
+    One-shot initial load for the frontend: history, transcript segments,
+    SOAP note, metrics and notifications in a single Redis round-trip,
+    replacing six separate polling calls on page open.
+    """
+    return await session_service.load_session_bootstrap(session_id)
+
 @router.get("/get_transcript")
 async def get_transcript(session_id: str, conversation_service: ConversationRepositoryAsync = Depends(get_conversation_service)):
     """
@@ -121,6 +162,17 @@ async def start_session(
         # Initialize any required Redis structures here
         await session_service.create_session(session_id, doctor_id, mrn)
 
+        # Warm the vLLM prefix cache now (worker-side, fire-and-forget) so
+        # the first chunk doesn't pay system-prompt prefill on its TTFT.
+        # Broker publish is blocking, so it goes through a worker thread.
+        # Best-effort: a failed warmup publish must never fail session start.
+        try:
+            await asyncio.to_thread(
+                celery_app.send_task, "warmup_llm", kwargs={"task_type": "soap"}
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Warmup publish failed (continuing without it): {e}")
+
         return {
             "status": "session_started",
             "session_id": session_id
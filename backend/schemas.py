@@ -46,11 +46,36 @@ class SOAPNote(BaseModel):
     def merge(self, new_note: 'SOAPNote'):
         """
         Merges new items (Deltas) into the existing note.
+
+        Dict-backed: one id->position index per section makes the merge
+        O(|state| + |delta|) instead of scanning the whole section per delta
+        item. Items whose id already exists are overwritten in place
+        (corrections); unseen ids are appended.
         """
-        self.subjective.extend(new_note.subjective)
-        self.objective.extend(new_note.objective)
-        self.assessment.extend(new_note.assessment)
-        self.plan.extend(new_note.plan)
+        for section in ("subjective", "objective", "assessment", "plan"):
+            current: List[SOAPItem] = getattr(self, section)
+            incoming: List[SOAPItem] = getattr(new_note, section)
+            if not incoming:
+                continue
+
+            position_by_id = {item.id: pos for pos, item in enumerate(current)}
+
+            for item in incoming:
+                pos = position_by_id.get(item.id)
+                if pos is not None:
+                    current[pos] = item
+                else:
+                    position_by_id[item.id] = len(current)
+                    current.append(item)
+
+class SessionBootstrap(BaseModel):
+    """Everything the frontend needs on conversation open, in one fetch."""
+    history: List[DialogueTurn] = Field(default_factory=list)
+    ui_segments: List[Dict[str, Any]] = Field(default_factory=list)
+    soap_note: Optional[SOAPNote] = None
+    metrics: Dict[str, Union[int, float, str]] = Field(default_factory=dict)
+    warnings: List[Dict[str, Any]] = Field(default_factory=list)
+    safety_alerts: List[Dict[str, Any]] = Field(default_factory=list)
 
 class SOAPNoteGeneration(BaseModel):
     subjective: List[str]
@@ -1,8 +1,9 @@
-import Levenshtein
-import json
-from typing import Dict, Any, Optional
+from rapidfuzz.distance import Levenshtein
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from pydantic import TypeAdapter
+
 # --- Project Imports ---
 from ..core.local_storage import local_storage
 from ..core.config import settings
@@ -13,6 +14,11 @@ from ..repositories.conversation import ConversationRepositoryAsync
 from ..repositories.documents import DocumentServiceAsync
 from ..repositories.metrics import MetricsServiceAsync
 from ..repositories.session import SessionRepositoryAsync
+# Schemas
+from ..schemas import DialogueTurn
+
+# Built once: the whole history dumps in a single pydantic-core pass
+_TURN_LIST_ADAPTER = TypeAdapter(List[DialogueTurn])
 
 class FeedbackService:
     """
@@ -78,8 +84,11 @@ class FeedbackService:
         prev_note = await self.document_service.get_soap_note(session_id)
         session_metadata = await self.session_service.get_session_metadata(session_id)
 
-        history_text = json.dumps([item.model_dump(mode='json') for item in history], indent=2)
-        prev_note_str = prev_note.model_dump_json(indent=2) if prev_note and task_type != 'soap' else "None"
+        # One adapter dump for the whole history instead of a per-turn
+        # model_dump + stdlib json re-encode; compact JSON — the pretty
+        # indent only padded the stored training records
+        history_text = _TURN_LIST_ADAPTER.dump_json(history).decode()
+        prev_note_str = prev_note.model_dump_json() if prev_note and task_type != 'soap' else "None"
         
         sys_prompt = get_system_prompt(task_type)
         suffix_prompt = get_suffix_prompt(task_type, "[NOTE_CONTEXT]")
@@ -209,6 +218,13 @@ class FeedbackService:
         if not original or not edited:
             return {"distance": 0, "similarity": 0.0}
 
+        # Identical round-trip (the UI often re-submits unchanged text):
+        # str == is a vectorized memcmp, so skip the O(n*m) DP outright
+        if original == edited:
+            return {"distance": 0, "similarity": 1.0}
+
+        # Bit-parallel (Myers) SIMD implementation; similarity derives
+        # from the same distance so the DP grid is only run once
         dist = Levenshtein.distance(original, edited)
         max_len = max(len(original), len(edited))
         
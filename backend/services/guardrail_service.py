@@ -1,10 +1,11 @@
 import re
-from typing import List, Set, Union, Dict, Any
+from typing import List, Set, Tuple, Union, Dict, Any
 
 # --- Project Imports ---
 from ..schemas import DialogueTurn
 from ..core.logger import logger
 from ..core.load_models import get_ner_pipeline, get_nli_pipeline
+from .safety import safety_service
 # Repositories
 from ..repositories.metrics import MetricsServiceSync
 
@@ -52,6 +53,26 @@ class GuardrailService:
         else:
             self.metrics_service = None
 
+    def run_post_chunk_checks(self, session_id: str, transcript: List[DialogueTurn], summary: Union[str, dict]) -> Tuple[List[str], List[str]]:
+        """
+        Runs both post-chunk quality checks in one place:
+        1. Hallucination guardrail (NER recall/precision + NLI consistency).
+        2. Dosage safety rules on the 'plan' section.
+        Returns (warnings, safety_alerts) so the worker makes a single call
+        instead of scheduling two separate check passes per chunk.
+        """
+        warnings = self.check_hallucination(session_id, transcript, summary)
+
+        # Safety service only inspects the treatment plan text
+        if isinstance(summary, dict):
+            plan_text = ', '.join([item.get('text', '') for item in summary.get('plan', [])])
+        else:
+            plan_text = str(summary)
+
+        alerts = safety_service._detect_rule_violations(plan_text) if plan_text else []
+
+        return warnings, alerts
+
     def check_hallucination(self, session_id: str, transcript: List[DialogueTurn], summary: Union[str, dict]) -> List[str]:
         """
         Public Method: Non-blocking wrapper.
@@ -76,9 +97,9 @@ class GuardrailService:
             else:
                 logger.info(f"✅ Guardrail passed. Metrics: {analysis_result['metrics']}")
             
-            # Save metrics to redis
+            # Save metrics to redis (NER counters are all ints: typed lane)
             if analysis_result['metrics']:
-                self.metrics_service.update_metrics(session_id, analysis_result['metrics'])
+                self.metrics_service.update_metrics_typed(session_id, ints=analysis_result['metrics'])
 
             return analysis_result['warnings']
 
@@ -129,11 +150,11 @@ class GuardrailService:
         }
 
         if not transcript or not summary:
-            return output        
+            return output
         # Extract entities using HF pipeline
+        # One batched forward over both texts instead of two separate passes.
         # Returns list of dicts: [{'entity_group': 'Disease_disorder', 'word': 'diabetes', ...}]
-        trans_results = self.ner_pipeline(transcript)
-        summ_results = self.ner_pipeline(summary)
+        trans_results, summ_results = self.ner_pipeline([transcript, summary])
 
         def get_medical_entities(results: List[Dict]) -> Set[str]:
             entities = set()
@@ -199,7 +220,8 @@ class GuardrailService:
             return []
 
         # Predict
-        scores = self.nli_model.predict(pairs)
+        # All (transcript, claim) pairs go through ONE batched forward pass
+        scores = self.nli_model.predict(pairs, batch_size=64)
         
         for i, score_array in enumerate(scores):
             label_idx = score_array.argmax()
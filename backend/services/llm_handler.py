@@ -89,11 +89,12 @@ class LLMHandler:
     # CORE EXECUTION FUNCTION (Low-Level)
     # ====================================================================
 
-    async def _execute_prompt(self, 
+    async def _execute_prompt(self,
                              messages: List[Dict[str, str]],
                              temperature: float,
                              lora_request_object: Optional[LoRARequest] = None,
-                             guided_decoding: Optional[GuidedDecodingParams] = None) -> str:
+                             guided_decoding: Optional[GuidedDecodingParams] = None,
+                             max_tokens: Optional[int] = None) -> str:
         """
         Executes a raw prompt against the VLLM engine asynchronously.
         This is a reusable core function that handles the AsyncGenerator stream.
@@ -112,7 +113,7 @@ class LLMHandler:
         # Configure Sampling Parameters (Generation Rules)
         sampling_params = SamplingParams(
             temperature=temperature,
-            max_tokens=settings.vllm_max_output_tokens, # Cap output length (e.g., 2048)
+            max_tokens=max_tokens or settings.vllm_max_output_tokens, # Cap output length (e.g., 2048)
             stop=settings.vllm_stop_sequences,          # Stop tokens (e.g., <|eot_id|>)
             guided_decoding=guided_decoding
         )
@@ -139,6 +140,24 @@ class LLMHandler:
             logger.exception(f"❌ VLLM Execution Error for request {request_id}: {e}")
             raise RuntimeError(f"LLM inference failed: {e}") from e
 
+    async def warmup(self, task_type: str = "soap"):
+        """
+        Prefill-only request over the canonical prompt prefix (the system
+        prompt generate_scribe always starts with). With prefix caching on,
+        the KV blocks stay allocated, so the session's first real chunk hits
+        the cache at token 1 instead of paying full prefill.
+        """
+        try:
+            await self._execute_prompt(
+                messages=[{"role": "system", "content": get_system_prompt(task_type)}],
+                temperature=0.0,
+                max_tokens=1
+            )
+            logger.info(f"🔥 Prefix cache warmed for task '{task_type}'.")
+        except Exception as e:
+            # Warmup is best-effort: never let it break session start
+            logger.warning(f"⚠️ Prefix warmup failed for '{task_type}': {e}")
+
     # ====================================================================
     # HIGH-LEVEL ORCHESTRATION (Task Specific)
     # ====================================================================
@@ -191,10 +210,14 @@ class LLMHandler:
             messages.append({"role": "user", "content": formatted_content})
         
         # 3. Context Serialization
-        # Convert the SOAPNote object to a JSON string for the LLM to read.
+        # Compact view of the existing note: section -> list of item texts.
+        # Item ids / source chunk indexes are bookkeeping the model doesn't
+        # need, and indentation is pure token waste on every chunk.
         if request.existing_notes:
-            # Ensure we serialize it to a formatted JSON string
-            context_str = request.existing_notes.model_dump_json(indent=2)
+            context_str = json.dumps({
+                section: [item.text for item in getattr(request.existing_notes, section)]
+                for section in ("subjective", "objective", "assessment", "plan")
+            })
         else:
             context_str = "None"
 
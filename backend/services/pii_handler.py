@@ -3,6 +3,7 @@ from typing import List
 from presidio_analyzer import AnalyzerEngine, PatternRecognizer, Pattern, RecognizerRegistry
 from presidio_anonymizer import AnonymizerEngine
 from presidio_anonymizer.entities import OperatorConfig
+from ..core.load_models import run_cpu_model
 from ..schemas import DialogueTurn
 
 class MedicalPIIHandler:
@@ -77,59 +78,71 @@ class MedicalPIIHandler:
         )
         registry.add_recognizer(disease_recognizer)
 
-    def _mask_dialogue(self, history: List[DialogueTurn]) -> List[DialogueTurn]:
+    # Entities we WANT to hide (built once, not per call)
+    TARGET_ENTITIES = [
+        "PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS",
+        "MEDICAL_ID", "MEDICAL_PROVIDER", "LOCATION"
+    ]
+
+    # Replacement operators (built once, not per turn)
+    OPERATORS = {
+        "DEFAULT": OperatorConfig("replace", {"new_value": "<REDACTED>"}),
+        "PERSON": OperatorConfig("replace", {"new_value": "<PATIENT>"}),
+        "MEDICAL_PROVIDER": OperatorConfig("replace", {"new_value": "<DOCTOR>"}),
+        "MEDICAL_ID": OperatorConfig("replace", {"new_value": "<MRN>"}),
+        "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "<PHONE>"}),
+    }
+
+    def mask_batch(self, texts: List[str]) -> List[str]:
         """
-        Iterates through the dialogue history and masks sensitive entities.
+        Primary masking entry point: flat list of strings in, masked strings out.
+
+        Working on plain strings (structure-of-arrays) instead of DialogueTurn
+        objects keeps the hot loop free of Pydantic attribute access and lets
+        callers feed any text batch through one pass.
         """
-        masked_history = []
-        
-        # Entities we WANT to hide
-        target_entities = [
-            "PERSON", "PHONE_NUMBER", "EMAIL_ADDRESS", 
-            "MEDICAL_ID", "MEDICAL_PROVIDER", "LOCATION"
-        ]
+        masked = []
 
-        for turn in history:
+        for text in texts:
             # 1. Analyze
             results = self.analyzer.analyze(
-                text=turn.content,
-                entities=target_entities,
+                text=text,
+                entities=self.TARGET_ENTITIES,
                 language='en'
             )
-            
+
             # Filter out conflicts: If "Parkinson" is detected as PERSON but also DISEASE_EPONYM,
             # we need logic. Ideally, Presidio prefers the custom one if scored higher.
-            # For this MVP, relying on standard Anonymizer logic usually works well enough 
+            # For this MVP, relying on standard Anonymizer logic usually works well enough
             # if we don't include "DISEASE_EPONYM" in the anonymizer list.
 
             # 2. Anonymize
             anonymized_result = self.anonymizer.anonymize(
-                text=turn.content,
+                text=text,
                 analyzer_results=results,
-                operators={
-                    "DEFAULT": OperatorConfig("replace", {"new_value": "<REDACTED>"}),
-                    "PERSON": OperatorConfig("replace", {"new_value": "<PATIENT>"}),
-                    "MEDICAL_PROVIDER": OperatorConfig("replace", {"new_value": "<DOCTOR>"}),
-                    "MEDICAL_ID": OperatorConfig("replace", {"new_value": "<MRN>"}),
-                    "PHONE_NUMBER": OperatorConfig("replace", {"new_value": "<PHONE>"}),
-                }
+                operators=self.OPERATORS
             )
+            masked.append(anonymized_result.text)
+
+        return masked
 
-            # 3. Rebuild
-            masked_history.append(DialogueTurn(
-                role=turn.role,
-                content=anonymized_result.text,
-                chunk_index=turn.chunk_index,
-                timestamp=turn.timestamp
-            ))
+    def _mask_dialogue(self, history: List[DialogueTurn]) -> List[DialogueTurn]:
+        """
+        Thin wrapper: extract contents, mask as one flat batch, scatter back.
+        """
+        masked_texts = self.mask_batch([turn.content for turn in history])
 
-        return masked_history
+        return [
+            turn.model_copy(update={"content": text})
+            for turn, text in zip(history, masked_texts)
+        ]
 
     async def mask_dialogue(self, history: List[DialogueTurn]) -> List[DialogueTurn]:
         """
         Async wrapper for masking dialogue history.
+        Runs on the dedicated CPU-model pool (bounded contention with vLLM).
         """
-        return await asyncio.to_thread(self._mask_dialogue, history)
+        return await run_cpu_model(self._mask_dialogue, history)
 
 
 # Singleton
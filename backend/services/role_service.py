@@ -2,6 +2,8 @@ import json
 import re
 from typing import List, Dict, Tuple
 
+from vllm.sampling_params import GuidedDecodingParams
+
 # --- Project Imports ---
 from ..services.llm_handler import llm_service
 from ..schemas import DialogueTurn
@@ -60,6 +62,16 @@ class RoleService:
 
         system_prompt = get_system_prompt("role_service")
 
+        # Constrain the output to a {id: role} map so the single batched call
+        # is parse-safe (no markdown fences, no per-turn round-trips).
+        guided_decoding = GuidedDecodingParams(json={
+            "type": "object",
+            "additionalProperties": {
+                "type": "string",
+                "enum": ["Doctor", "Patient", "Unknown"]
+            }
+        })
+
         try:
             # Temperature 0.0 is best for classification tasks
             response_text = await llm_service._execute_prompt(
@@ -67,7 +79,8 @@ class RoleService:
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": input_json}
                 ],
-                temperature=0.0
+                temperature=0.0,
+                guided_decoding=guided_decoding
             )
             
             # Parsing Logic
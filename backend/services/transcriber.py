@@ -3,7 +3,9 @@ import torch
 import whisperx
 import gc
 import asyncio
-from typing import Dict, Any, List
+import subprocess
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple, Union
 import spacy
 # --- Project Imports (Relative Paths) ---
 from ..core.config import settings
@@ -21,20 +23,33 @@ class TranscriberService:
     """
 
     def __init__(self):
-        # Detect hardware. WhisperX requires CUDA for alignment/diarization usually.
-        self.device = "cpu" #"cuda" if torch.cuda.is_available() else "cpu"
-        self.compute_type = "int8" #"int8" if self.device == "cuda" else "int8"
-        self.batch_size = 2 # Adjust based on remaining VRAM
-        
+        # Hardware & quantization come from Settings so deployments can pick
+        # e.g. device='cuda' + compute_type='int8_float16' without code changes.
+        self.device = settings.whisper_device
+        self.compute_type = settings.whisper_compute_type
+        self.batch_size = settings.whisper_batch_size # Adjust based on remaining VRAM
+
         logger.info(f"🎤 Initializing WhisperX on {self.device} ({self.compute_type})...")
-        
+
         # 1. Load Whisper Model (ASR)
+        # WhisperX runs on the CTranslate2 backend (faster-whisper), so int8
+        # engines are a config flag rather than a separate runtime.
         try:
             self.model = whisperx.load_model(
-                settings.whisper_model_size, 
-                self.device, 
+                settings.whisper_model_size,
+                self.device,
                 compute_type=self.compute_type,
-                language="en" # Force English for consistency in this MVP
+                language="en", # Force English for consistency in this MVP
+                asr_options={
+                    # VAD segments decode independently within the batch —
+                    # never conditioned on the previous segment's text. This
+                    # is what makes parallel decode safe, and it also stops a
+                    # bad segment from poisoning the rest of the chunk.
+                    "condition_on_previous_text": False,
+                    # Greedy decode: measurably faster, negligible WER delta
+                    # on short conversational segments.
+                    "beam_size": 1,
+                }
             )
 
             logger.info("⏳ Loading Alignment Model (English)...")
@@ -63,14 +78,143 @@ class TranscriberService:
     async def transcribe_audio(self, audio_path: str, chunk_index: int, confidence_threshold: float = 0.6) -> Dict[str, Any]:
         """
         Async wrapper for the transcription pipeline.
+        Routes through the batch scheduler so concurrent sessions share one
+        batched Whisper call instead of decoding alone.
         """
-        return await asyncio.to_thread(
-            self._transcribe_audio, 
-            audio_path, 
-            chunk_index, 
-            confidence_threshold
+        return await batched_transcriber.transcribe(audio_path, chunk_index, confidence_threshold)
+
+    async def transcribe_array(self, pcm: np.ndarray, chunk_index: int, confidence_threshold: float = 0.6) -> Dict[str, Any]:
+        """
+        Transcribes an in-memory float32 PCM buffer (16kHz mono).
+        Skips the disk round-trip entirely for callers that already hold bytes.
+        """
+        return await batched_transcriber.transcribe(pcm, chunk_index, confidence_threshold)
+
+    def _load_pcm(self, source) -> np.ndarray:
+        """
+        Normalizes any audio source into a float32 16kHz mono waveform.
+        - ndarray: already decoded, pass through.
+        - bytes:   decode in-process via an ffmpeg pipe (no temp file written).
+        - path:    read once, then decode through the same pipe.
+        """
+        if isinstance(source, np.ndarray):
+            return source
+
+        if isinstance(source, (bytes, bytearray)):
+            raw = bytes(source)
+        else:
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Audio file not found: {source}")
+            with open(source, "rb") as f:
+                raw = f.read()
+
+        # Decode via stdin/stdout pipes: the payload never touches disk again.
+        process = subprocess.run(
+            ["ffmpeg", "-nostdin", "-i", "pipe:0",
+             "-f", "s16le", "-ac", "1", "-ar", "16000", "pipe:1"],
+            input=raw,
+            capture_output=True,
         )
-    
+        if process.returncode != 0:
+            raise RuntimeError(f"ffmpeg decode failed: {process.stderr.decode(errors='ignore')[-500:]}")
+
+        return np.frombuffer(process.stdout, np.int16).astype(np.float32) / 32768.0
+
+    def _transcribe_batch(self, requests: List[Tuple[Any, int, float]]) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Transcribes several audio files in ONE Whisper call.
+
+        Strategy: concatenate the waveforms (with a silence gap between them so
+        VAD never merges speech across file boundaries), run a single batched
+        transcribe+align pass, then split the segments back per file using the
+        known sample offsets.
+
+        Each source is loaded under its own try/except: a missing file or a
+        corrupt upload fails only ITS slot (the Exception is returned in its
+        position) while the rest of the batch still transcribes.
+        """
+        SAMPLE_RATE = 16000
+        GAP_SECONDS = 1.0  # Silence inserted between files (keeps VAD segments separable)
+
+        try:
+            # --- Step 1: Load & Concatenate (per-request failure isolation) ---
+            gap = np.zeros(int(SAMPLE_RATE * GAP_SECONDS), dtype=np.float32)
+            waveforms = []
+            boundaries = []  # (request_pos, start_sec, end_sec) inside the merged audio
+            outputs: List[Union[Dict[str, Any], Exception]] = [None] * len(requests)
+            cursor = 0.0
+
+            for pos, (source, _, _) in enumerate(requests):
+                try:
+                    audio = self._load_pcm(source)
+                except Exception as e:
+                    logger.warning(f"⚠️ [Batch] Skipping unloadable audio source: {e}")
+                    outputs[pos] = e
+                    continue
+                duration = len(audio) / SAMPLE_RATE
+                boundaries.append((pos, cursor, cursor + duration))
+                waveforms.append(audio)
+                waveforms.append(gap)
+                cursor += duration + GAP_SECONDS
+
+            if not waveforms:
+                # Every source failed to load — nothing to transcribe
+                return outputs
+
+            merged_audio = np.concatenate(waveforms)
+
+            # --- Step 2: Single Batched Transcribe + Align ---
+            # One call means one GPU batch; VAD chunks from ALL files fill it.
+            result = self.model.transcribe(merged_audio, batch_size=max(self.batch_size, len(boundaries)))
+            result = whisperx.align(
+                result["segments"],
+                self.align_model,
+                self.align_metadata,
+                merged_audio,
+                device=self.device,
+                return_char_alignments=False
+            )
+            torch.cuda.empty_cache()
+
+            # --- Step 3: Demultiplex segments back to each request ---
+            for pos, start_sec, end_sec in boundaries:
+                _, chunk_index, threshold = requests[pos]
+                own_segments = []
+                for segment in result["segments"]:
+                    # A segment belongs to the file its midpoint falls into
+                    midpoint = (segment["start"] + segment["end"]) / 2
+                    if start_sec <= midpoint < end_sec + GAP_SECONDS:
+                        own_segments.append(self._shift_segment(segment, -start_sec))
+
+                outputs[pos] = self._format_response(
+                    {"segments": own_segments}, threshold, chunk_index
+                )
+
+            return outputs
+
+        finally:
+            gc.collect()
+            torch.cuda.empty_cache()
+
+    @staticmethod
+    def _shift_segment(segment: Dict[str, Any], offset: float) -> Dict[str, Any]:
+        """
+        Rebases a segment's timestamps (and its words') by 'offset' seconds,
+        so times are relative to the original file instead of the merged audio.
+        """
+        shifted = dict(segment)
+        shifted["start"] = segment["start"] + offset
+        shifted["end"] = segment["end"] + offset
+        if "words" in segment:
+            shifted["words"] = [
+                {**w,
+                 "start": w.get("start", 0.0) + offset,
+                 "end": w.get("end", 0.0) + offset}
+                for w in segment["words"]
+            ]
+        return shifted
+
+
     def _transcribe_audio(self, audio_path: str, chunk_index: int, confidence_threshold: float = 0.6) -> Dict[str, Any]:
         """
         Executes the full pipeline: Transcribe -> Align -> Diarize -> Format.
@@ -253,6 +397,81 @@ class TranscriberService:
             "raw_segments": raw_segments
         }
 
+class BatchedTranscriber:
+    """
+    Request-coalescing scheduler for Whisper.
+
+    Concurrent transcribe calls (multiple clinicians streaming chunks at once)
+    land on an asyncio.Queue. A background coroutine drains up to 'max_batch'
+    requests (waiting at most 'max_wait' for stragglers) and runs them as ONE
+    batched Whisper call via TranscriberService._transcribe_batch.
+    Each caller gets its own result back through a Future.
+    """
+
+    def __init__(self, service: TranscriberService, max_batch: int = 8, max_wait: float = 0.02):
+        self.service = service
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    async def transcribe(self, audio_path: str, chunk_index: int, confidence_threshold: float = 0.6) -> Dict[str, Any]:
+        """
+        Submits one file to the scheduler and awaits its transcription result.
+        """
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio_path, chunk_index, confidence_threshold, future))
+        return await future
+
+    def _ensure_worker(self):
+        # Lazy init: the queue/task must be created on the running loop.
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._drain_loop())
+
+    async def _drain_loop(self):
+        while True:
+            # Block until at least one request arrives
+            batch = [await self._queue.get()]
+
+            # Collect stragglers: up to max_batch or until max_wait elapses
+            deadline = asyncio.get_running_loop().time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            requests = [(path, idx, thr) for path, idx, thr, _ in batch]
+            futures = [fut for _, _, _, fut in batch]
+
+            logger.info(f"🎛️ [Batch] Transcribing {len(batch)} chunk(s) in one Whisper call...")
+
+            try:
+                # Heavy lifting happens off the event loop
+                results = await asyncio.to_thread(self.service._transcribe_batch, requests)
+                for fut, result in zip(futures, results):
+                    if fut.done():
+                        continue
+                    # A slot holds its own Exception when only that source
+                    # failed to load; the rest of the batch still succeeded.
+                    if isinstance(result, Exception):
+                        fut.set_exception(result)
+                    else:
+                        fut.set_result(result)
+            except Exception as e:
+                logger.exception(f"❌ Batched transcription failed: {e}")
+                for fut in futures:
+                    if not fut.done():
+                        fut.set_exception(e)
+
+
 # Singleton Instance
 # Models are loaded upon import (be mindful of startup time)
-transcriber_service = TranscriberService()
\ No newline at end of file
+transcriber_service = TranscriberService()
+batched_transcriber = BatchedTranscriber(transcriber_service)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import json
+import socket
+from typing import List
+# Exception Imports
+from redis.exceptions import ConnectionError as RedisConnectionError, ResponseError, TimeoutError as RedisTimeoutError
+from pydantic import TypeAdapter, ValidationError
+# --- Project Imports ---
+from ..core.logger import logger
+from ..core.redis_client_sync import redis_client
+# Services
+from ..services.guardrail_service import GuardrailService
+# Repositories
+from ..repositories.notification import NotificationServiceSync
+# Schemas
+from ..schemas import DialogueTurn
+
+# One validator call covers a whole event's turns
+_TURN_LIST_ADAPTER = TypeAdapter(List[DialogueTurn])
+
+# Stream / consumer-group names for post-chunk quality checks
+CHECKS_STREAM = "post_chunk_checks"
+CHECKS_GROUP = "guardrail"
+
+# Batch tuning: drain up to COUNT pending events per read, block BLOCK_MS
+# while idle. Bursty arrivals get coalesced into few reads automatically.
+READ_COUNT = 32
+BLOCK_MS = 2000
+
+# XACK only clears the pending-entries list; the entries themselves stay
+# in the stream forever unless it is trimmed. Cap it at roughly this many
+# events (approximate trim — '~' — so Redis only drops whole macro nodes).
+STREAM_MAXLEN = 10_000
+
+def enqueue_post_chunk_checks(redis_conn, session_id: str, chunk_index: int, safe_turns: List[str], delta_json: str):
+    """
+    Publishes one check event onto the stream. Called by the ingest task;
+    XADD is O(1) and the pipeline never waits on the heavy models.
+
+    Both payload fields arrive pre-serialized: the turns are already
+    individual JSON strings (joined into one array here, not re-encoded)
+    and the delta is the producer's single model_dump_json — no second
+    serialization pass on either side.
+    """
+    redis_conn.xadd(CHECKS_STREAM, {
+        "session_id": session_id,
+        "chunk_index": str(chunk_index),
+        "safe_turns": "[" + ",".join(safe_turns) + "]",
+        "delta_dict": delta_json
+    }, maxlen=STREAM_MAXLEN, approximate=True)
+
+def _process_check(guardrail_service: GuardrailService, notification_service: NotificationServiceSync, fields: dict):
+    """
+    Runs the fused guardrail + safety pass for a single stream event.
+    """
+    session_id = fields["session_id"]
+    chunk_index = int(fields["chunk_index"])
+
+    try:
+        turns = _TURN_LIST_ADAPTER.validate_json(fields["safe_turns"])
+    except (ValidationError, TypeError):
+        turns = []
+
+    delta_dict = json.loads(fields["delta_dict"])
+
+    warnings, alerts = guardrail_service.run_post_chunk_checks(session_id, turns, delta_dict)
+
+    if warnings:
+        notification_service.add_warning(session_id, warnings, chunk_index)
+        logger.warning(f"⚠️ [Checks] Chunk {chunk_index} Guardrail Warnings: {warnings}")
+
+    if alerts:
+        notification_service.add_safety_alert(session_id, alerts, chunk_index)
+        logger.warning(f"⚠️ [Checks] Chunk {chunk_index} Safety Alert: {alerts}")
+
+def consume_checks():
+    """
+    Blocking consumer loop for the post-chunk checks stream.
+
+    XREADGROUP with count=32 drains bursts of pending events in one read
+    (consumer groups give at-least-once delivery + backpressure for free),
+    processes them, and XACKs each event only after its notifications are
+    written — a crashed consumer leaves events pending for redelivery.
+
+    Run with: python -m backend.tasks.checks
+    """
+    redis_client.connect()
+    redis_conn = redis_client.get_instance()
+
+    # Create group + stream if missing; BUSYGROUP means it already exists.
+    try:
+        redis_conn.xgroup_create(CHECKS_STREAM, CHECKS_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+    consumer_name = f"checks-{socket.gethostname()}-{id(redis_conn)}"
+    guardrail_service = GuardrailService(redis_client)
+    notification_service = NotificationServiceSync(redis_client)
+
+    logger.info(f"🛡️ [Checks] Consumer '{consumer_name}' listening on '{CHECKS_STREAM}'...")
+
+    while True:
+        try:
+            batches = redis_conn.xreadgroup(
+                CHECKS_GROUP, consumer_name,
+                {CHECKS_STREAM: ">"},
+                count=READ_COUNT,
+                block=BLOCK_MS
+            )
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            logger.warning(f"⚠️ [Checks] Redis read failed ({e}). Retrying...")
+            continue
+
+        if not batches:
+            continue  # Idle: block expired with nothing pending
+
+        for _, messages in batches:
+            for message_id, fields in messages:
+                try:
+                    _process_check(guardrail_service, notification_service, fields)
+                    redis_conn.xack(CHECKS_STREAM, CHECKS_GROUP, message_id)
+                except Exception as e:
+                    # Leave un-acked for redelivery; don't kill the loop
+                    logger.exception(f"❌ [Checks] Failed processing {message_id}: {e}")
+
+if __name__ == "__main__":
+    consume_checks()
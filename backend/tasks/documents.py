@@ -8,6 +8,7 @@ from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutErr
 from requests.exceptions import RequestException
 from pydantic import ValidationError
 # --- Project Imports ---
+from ..core import json_fast
 from ..core.celery_app import celery_app
 from ..core.decorators import async_worker_task
 from ..core.logger import logger
@@ -18,6 +19,7 @@ from ..services.llm_handler import llm_service
 # Repositories
 from ..repositories.documents import DocumentServiceSync
 from ..repositories.metrics import MetricsServiceSync
+from ..repositories.notification import get_notification_channel
 # Schemas
 from ..schemas import (
     ScribeRequest, 
@@ -78,13 +80,24 @@ def generate_document_task(self, session_id: str, task_type: str, history: List[
                 request.task_type, 
                 response.generated_summary
             )
-            
-        return {
+
+        result = {
             "status": "success",
             "task_type": task_type,
             "data": response.generated_summary
         }
 
+        # 5. Push completion over the session's pub/sub channel so
+        # WebSocket subscribers hear about it immediately instead of
+        # hammering /task_status with AsyncResult polls (which cost a
+        # Redis GET each). Polling stays as the fallback.
+        redis_client.get_instance().publish(
+            get_notification_channel(session_id),
+            json_fast.dumps({"type": "document_ready", **result})
+        )
+
+        return result
+
     except Retry:
         raise
     
@@ -97,4 +110,12 @@ def generate_document_task(self, session_id: str, task_type: str, history: List[
             raise self.retry(exc=e, countdown=3)
         
         logger.exception(f"❌ Error generating {task_type} for session {session_id}: {e}")
-        return {"status": "failed", "error": str(e)}
+        result = {"status": "failed", "task_type": task_type, "error": str(e)}
+        try:
+            redis_client.get_instance().publish(
+                get_notification_channel(session_id),
+                json_fast.dumps({"type": "document_failed", **result})
+            )
+        except Exception:
+            pass  # the poll fallback still reports the failure
+        return result
@@ -1,6 +1,9 @@
 import os
 import time
 import json
+import asyncio
+import threading
+from typing import Any, Dict, Optional
 from celery import Task
 from ..core.celery_app import celery_app
 # Exception Imports
@@ -12,15 +15,15 @@ from ..services.transcriber import transcriber_service
 from ..services.role_service import role_service
 from ..services.llm_handler import llm_service
 from ..services.pii_handler import pii_service
-from ..services.guardrail_service import GuardrailService
-from ..services.safety import safety_service
 # Repositories
 from ..repositories.conversation import ConversationRepositorySync
 from ..repositories.documents import DocumentServiceSync
 from ..repositories.metrics import MetricsServiceSync
-from ..repositories.notification import NotificationServiceSync
 from ..repositories.buffer import BufferServiceSync
+# Tasks
+from .checks import enqueue_post_chunk_checks
 # Cores
+from ..core.config import settings
 from ..core.redis_client_sync import redis_client
 from ..core.logger import logger
 from ..core.async_runtime import run_async
@@ -31,6 +34,62 @@ from ..schemas import (
     SOAPNote
 )
 
+# ------------------------------------------------------
+# In-process Session State Cache
+# ------------------------------------------------------
+# Chunks of one session are processed strictly in order (ticket system), so
+# after chunk N this worker already holds the exact history/note that chunk
+# N+1 would re-fetch from Redis. Cache them keyed by session; the entry is
+# only trusted when its next_index matches the chunk being processed, so an
+# out-of-order pickup (e.g. another worker handled a chunk) falls back to
+# Redis automatically. Redis writes stay as-is — this skips reads only.
+#
+# Bounded: entries for sessions abandoned mid-stream (never sending a
+# last chunk) are swept once they outlive the session TTL, and the cache
+# holds at most _STATE_CACHE_MAX sessions (oldest-touched evicted first).
+_state_lock = threading.Lock()
+_state_cache: Dict[str, Dict[str, Any]] = {}
+_STATE_CACHE_MAX = 64
+_STATE_CACHE_TTL = settings.session_ttl
+
+def _get_cached_state(session_id: str, expected_index: int) -> Optional[Dict[str, Any]]:
+    with _state_lock:
+        state = _state_cache.get(session_id)
+        if state and state["next_index"] == expected_index:
+            return state
+    return None
+
+def _store_cached_state(session_id: str, history: list, note, next_index: int):
+    now = time.monotonic()
+    with _state_lock:
+        # Sweep abandoned sessions, then evict oldest-touched if still full
+        cutoff = now - _STATE_CACHE_TTL
+        for key in [k for k, s in _state_cache.items() if s["touched"] < cutoff]:
+            del _state_cache[key]
+        if len(_state_cache) >= _STATE_CACHE_MAX and session_id not in _state_cache:
+            oldest = min(_state_cache, key=lambda k: _state_cache[k]["touched"])
+            del _state_cache[oldest]
+
+        _state_cache[session_id] = {
+            "history": history,
+            "note": note,
+            "next_index": next_index,
+            "touched": now
+        }
+
+def _drop_cached_state(session_id: str):
+    with _state_lock:
+        _state_cache.pop(session_id, None)
+
+@celery_app.task(name="warmup_llm", ignore_result=True)
+def warmup_llm(task_type: str = "soap"):
+    """
+    [GPU Task] Fired at session start: prefill-only request that parks the
+    canonical system-prompt prefix in vLLM's prefix cache, so the session's
+    first real chunk skips that prefill (TTFT off the user-visible path).
+    """
+    run_async(llm_service.warmup(task_type))
+
 @celery_app.task(bind=True, max_retries=3, name="process_audio_chunk")
 def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index: int, is_last_chunk: bool):
     """
@@ -51,9 +110,7 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
     conversation_service = ConversationRepositorySync(redis_client)
     document_service = DocumentServiceSync(redis_client)
     metrics_service = MetricsServiceSync(redis_client)
-    notification_service = NotificationServiceSync(redis_client)
     buffer_service = BufferServiceSync(redis_client)
-    guardrail_service = GuardrailService(redis_client)
 
     try:
         # ------------------------------------------------------
@@ -93,10 +150,12 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
             
         # 1. Run Whisper (ASR)
         # Returns raw text with timestamps and assigns chunk_index to turns
-        transcribe_result = transcriber_service._transcribe_audio(
-            file_path, 
+        # Goes through the batch scheduler: concurrent worker threads share
+        # one batched Whisper call instead of decoding alone.
+        transcribe_result = run_async(transcriber_service.transcribe_audio(
+            file_path,
             chunk_index=chunk_index
-        )
+        ))
         raw_turns = transcribe_result["conversation"] # List[DialogueTurn] with TBD roles
         
         if not raw_turns:
@@ -108,34 +167,42 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
                 chunk_index=chunk_index
             )
 
-        # 2. Role Assignment (Tagging)
-        # Uses LLM to tag 'Doctor' or 'Patient' based on context
-        tagged_turns = run_async(role_service.assign_roles(raw_turns))
-        
+        # 2+3. Role Assignment (LLM) + PII Masking (CPU NER) in parallel
+        # Masking only touches turn content, never roles, so both can run
+        # on the raw turns concurrently: wall time = max(role, pii), not sum.
+        tagged_turns, masked_turns = run_async(asyncio.gather(
+            role_service.assign_roles(raw_turns),
+            pii_service.mask_dialogue(raw_turns)
+        ))
+
         if "raw_segments" in transcribe_result:
             for i, turn in enumerate(tagged_turns):
                 # Ensure we don't go out of bounds (they should be 1:1)
                 if i < len(transcribe_result["raw_segments"]):
                     transcribe_result["raw_segments"][i].speaker = turn.role
 
-        # 3. PII Masking
-        # Mask sensitive data before storage or LLM processing
-        safe_turns = pii_service._mask_dialogue(tagged_turns)
+        # Merge: masked content + LLM-assigned role
+        safe_turns = [
+            masked.model_copy(update={"role": tagged.role})
+            for tagged, masked in zip(tagged_turns, masked_turns)
+        ]
         
         # 6. Save to History (Redis)
         # Persist the dialogue state
         conversation_service.add_ui_segments(session_id, transcribe_result["raw_segments"])
         conversation_service.add_dialogue_turns(session_id, safe_turns)
 
-        # 7. Run vLLM (Summary/Extraction)
-        full_history = conversation_service.get_dialogue_history(session_id)
-        
-        # We use get_backup_soap_note inside llm_handler logic via ScribeRequest?
-        # Actually, llm_handler expects us to pass the 'existing_notes'.
-        # Since this is an update, we fetch the CURRENT state to pass as context.
-        # Inside update_soap_note, it will be backed up automatically before overwrite.
-        
-        current_note = document_service.get_soap_note(session_id)
+        # 7. Assemble LLM context (cache-first)
+        # Consecutive chunks of the same session reuse the state this worker
+        # just wrote instead of re-reading history + note from Redis.
+        cached_state = _get_cached_state(session_id, current_expected_index)
+
+        if cached_state is not None:
+            full_history = cached_state["history"] + safe_turns
+            current_note = cached_state["note"]
+        else:
+            full_history = conversation_service.get_dialogue_history(session_id)
+            current_note = document_service.get_soap_note(session_id)
         
         scribe_request = ScribeRequest(
             session_id=session_id,
@@ -156,10 +223,14 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
             if not current_note:
                 new_state = delta_note
             else:
-                # Merge Delta into Current
-                # Note: We should probably create a new object to avoid mutation issues
-                new_state = current_note.model_copy()
-                new_state.merge(delta_note)
+                # Merge Delta into Current, in place.
+                # model_copy() here was a shallow copy: the section lists were
+                # shared with current_note, so merge mutated both objects and
+                # the copy only added allocation cost. Nobody else holds this
+                # reference (it is re-fetched or cache-replaced next chunk),
+                # so merging directly is safe and skips the O(N) copy.
+                current_note.merge(delta_note)
+                new_state = current_note
             
             # Commit to Redis (This triggers Backup logic internally)
             document_service.update_soap_note(session_id, new_state)
@@ -167,35 +238,32 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
             # Update response with the FULL merged note for UI display
             response.generated_summary = new_state
 
-        # 8. Run Safety Checks
-        delta_dict = delta_note.model_dump() if isinstance(delta_note, SOAPNote) else {}
-
-        warnings = guardrail_service.check_hallucination(session_id, safe_turns, delta_dict)
+            # Write-through: next chunk of this session skips the Redis reads
+            _store_cached_state(session_id, full_history, new_state, current_expected_index + 1)
 
-        if warnings:        
-            notification_service.add_warning(session_id, warnings, chunk_index)
-            logger.warning(f"⚠️ [Background] Chunk {chunk_index} Guardrail Warnings: {warnings}")
+        # 8. Publish Guardrail + Safety Checks event (Redis stream)
+        # One O(1) XADD; the checks consumer (backend.tasks.checks) drains
+        # pending events in batches via its consumer group, so bursty chunk
+        # arrivals coalesce instead of fanning out one task per chunk.
+        # Serialize the delta ONCE straight to JSON — the old
+        # model_dump() + json.dumps() pair walked the note tree twice.
+        delta_json = delta_note.model_dump_json() if isinstance(delta_note, SOAPNote) else "{}"
 
-        # Dict -> String (Safety Service accepts text only)
-        # only get plan field 
-        if isinstance(delta_dict, dict):
-            # assume element follows SOAPItem schema.
-            summary_text = ', '.join([item.get('text', '') for item in delta_dict.get('plan', [])])
-        else:
-            summary_text = str(delta_dict)
-
-        alerts = safety_service._detect_rule_violations(summary_text)
-        
-        if alerts:
-            notification_service.add_safety_alert(session_id, alerts, chunk_index)
-            logger.warning(f"⚠️ [Background] Chunk {chunk_index} Safety Alert: {alerts}")
+        enqueue_post_chunk_checks(
+            conversation_service.redis_client,
+            session_id=session_id,
+            chunk_index=chunk_index,
+            safe_turns=[turn.model_dump_json() for turn in safe_turns],
+            delta_json=delta_json
+        )
 
         # 9. end of pipeline
         pipeline_duration = (time.time() - pipeline_start) * 1000 # ms
         
         if is_last_chunk:
-            logger.info(f"🏁 Final Chunk Processed! Latency: {pipeline_duration:.2f}ms")    
+            logger.info(f"🏁 Final Chunk Processed! Latency: {pipeline_duration:.2f}ms")
             metrics_service.update_metrics(session_id, pipeline_duration, 'final_e2e_latency_ms')
+            _drop_cached_state(session_id) # Session over: free the cached state
 
         # 10. Clean up Temp File
         try:
@@ -259,6 +327,9 @@ def process_audio_chunk(self: Task, file_path: str, session_id: str, chunk_index
 
         # 1. Unblock the pipeline (call the next ticket number)
         conversation_service.increment_expected_chunk_index(session_id)
+
+        # Cache no longer reflects what the next chunk should see
+        _drop_cached_state(session_id)
         
         # 2. Clean up the file (now it's really over, so it's okay to delete)
         try:
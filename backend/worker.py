@@ -1,10 +1,12 @@
 import sys
 import os
-from celery.signals import worker_process_init, worker_ready
+import threading
+from celery.signals import worker_process_init, worker_ready, worker_shutdown
 from .core.logger import logger
 from .core.celery_app import celery_app
-from .core.async_runtime import start_background_loop
+from .core.async_runtime import start_background_loop, run_async
 from .core.redis_client_sync import redis_client
+from .core.redis_client import redis_client as async_redis_client
 # 1. Wrap services in try-except for Import (Fail Fast)
 # If errors occur during model loading (GPU OOM, missing keys), terminate worker immediately.
 try:
@@ -13,6 +15,7 @@ try:
     # Tasks
     from .tasks.ingest import process_audio_chunk
     from .tasks.documents import generate_document_task
+    from .tasks.checks import consume_checks
 
     logger.info("✅ [Worker] All tasks imported successfully.")
 
@@ -31,10 +34,24 @@ def on_worker_ready(**kwargs):
     start_background_loop()  # Ensure async runtime is started
     redis_client.connect()  # Ensure Redis connection is established
 
+    # Post-chunk checks consumer: the XREADGROUP loop blocks, so it runs
+    # on its own daemon thread and dies with the worker.
+    threading.Thread(target=consume_checks, name="checks-consumer", daemon=True).start()
+    logger.info("🛡️ [Worker] Checks stream consumer started.")
+
     logger.info("""
     🚀 ===================================================
     🚀  Worker is READY and LISTENING for tasks
     🚀  - Mode: Thread Pool (Shared Memory)
     🚀  - GPU: Active (LLM + Whisper)
     🚀 ===================================================
-    """)
\ No newline at end of file
+    """)
+# 3. Worker Shutdown Signal
+# Close the loop-cached async Redis connection (kept alive across tasks).
+@worker_shutdown.connect
+def on_worker_shutdown(**kwargs):
+    logger.info("🛑 [Worker] Closing cached async Redis connection...")
+    try:
+        run_async(async_redis_client.disconnect())
+    except Exception as e:
+        logger.warning(f"⚠️ [Worker] Failed to close async Redis connection: {e}")
@@ -1,3 +1,5 @@
+import time
+
 import requests
 import streamlit as st
 
@@ -69,10 +71,23 @@ def fetch_soap_note(session_id: str):
     
 def fetch_warnings(session_id: str):
     api_base = get_api_base()
+
+    # Honor the server's next_poll_ms pacing hint: inside the quiet
+    # window, reuse the last payload instead of issuing another request.
+    if time.monotonic() < st.session_state.get("warnings_next_poll_at", 0.0):
+        return st.session_state.get(
+            "warnings_last_payload", {"warnings": [], "safety_alerts": []}
+        )
+
     try:
         resp = requests.get(f"{api_base}/check_notifications", params={"session_id": session_id})
         if resp.status_code == 200:
-            return resp.json()
+            data = resp.json()
+            st.session_state.warnings_next_poll_at = (
+                time.monotonic() + data.get("next_poll_ms", 0) / 1000.0
+            )
+            st.session_state.warnings_last_payload = data
+            return data
         else:
             st.error(f"API Error ({resp.status_code}): {resp.text}")
             return {
@@ -108,7 +123,8 @@ def submit_feedback(session_id: str, feedback_type: str, edited_content: str = "
             "edited_content": edited_content
         }
         resp = requests.post(f"{api_base}/submit_feedback", data=payload)
-        if resp.status_code == 200:
+        # Backend replies 202 now that persistence runs as a background task
+        if resp.status_code in (200, 202):
             st.success("Feedback submitted successfully.")
         else:
             st.error(f"API Error ({resp.status_code}): {resp.text}")